@@ -1,39 +1,165 @@
+"""
+Add cards and emails to the pool.
+
+Usage:
+    python add_to_pool.py cards cards.txt [more.txt ...] [--priority N] [--batch-size N]
+    python add_to_pool.py emails emails.txt
+    cat emails.txt | python add_to_pool.py emails -
+
+Files use the same format and validation as /bulk_cards and /bulk_emails.
+Input is streamed in batches, so memory stays bounded for files with
+millions of lines. Entries already in the pool (or repeated in the input)
+are skipped using the pool's lookup indexes, and invalid lines are
+reported and skipped.
+"""
+import argparse
 import sqlite3
-from pathlib import Path
+import sys
+import time
+from itertools import islice
 
-DB_PATH = Path(__file__).parent / 'data' / 'pool.db'
+# Importing db runs init_db, so the tables, priority columns and indexes exist
+from db import DB_PATH
+from validation import parse_card_line, parse_email_line
 
-def add_cards(cards):
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.executemany(
-        'INSERT INTO cards (number, cvv) VALUES (?, ?)',
-        cards
-    )
-    conn.commit()
-    conn.close()
+# Rows inserted per transaction; large enough to amortize commits,
+# small enough to keep memory and lock hold times low
+DEFAULT_BATCH_SIZE = 20_000
+
+# Invalid lines printed before only counting the rest
+MAX_REPORTED_ERRORS = 10
+
+# Insert only if the same entry is not already in the pool (indexed lookup)
+INSERT_SQL = {
+    'cards': (
+        'INSERT INTO cards (number, cvv, priority) SELECT ?, ?, ? '
+        'WHERE NOT EXISTS (SELECT 1 FROM cards WHERE number = ? AND cvv = ?)'
+    ),
+    'emails': (
+        'INSERT INTO emails (email, priority) SELECT ?, ? '
+        'WHERE NOT EXISTS (SELECT 1 FROM emails WHERE email = ?)'
+    ),
+}
+
+def add_cards(cards, priority=0):
+    """
+    Add (number, cvv) pairs with the same validation and duplicate checks as the importer.
+    Returns:
+        dict: counts of entries read, added, duplicates and invalid entries.
+    """
+    lines = (('add_cards', i, f"{number},{cvv}") for i, (number, cvv) in enumerate(cards, 1))
+    return import_lines('cards', lines, priority, progress=False)
+
+def add_emails(emails, priority=0):
+    """
+    Add emails with the same validation and duplicate checks as the importer.
+    Returns:
+        dict: counts of entries read, added, duplicates and invalid entries.
+    """
+    lines = (('add_emails', i, email) for i, email in enumerate(emails, 1))
+    return import_lines('emails', lines, priority, progress=False)
+
+def iter_lines(paths):
+    """Yield (source, line number, line) from files, or stdin for '-'."""
+    for path in paths:
+        if path == '-':
+            yield from (('stdin', i, line) for i, line in enumerate(sys.stdin, 1))
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            yield from ((path, i, line) for i, line in enumerate(f, 1))
+
+def iter_valid_rows(kind, lines, priority, stats):
+    """Validate lines and yield insert parameters, counting invalid lines in stats."""
+    parse = parse_card_line if kind == 'cards' else parse_email_line
+    for source, i, line in lines:
+        line = line.strip()
+        if not line:  # Skip empty lines
+            continue
+        stats['read'] += 1
+        value, reason = parse(line)
+        if value is None:
+            stats['invalid'] += 1
+            if stats['invalid'] <= MAX_REPORTED_ERRORS:
+                print(f"{source} line {i}: '{line}' ({reason})", file=sys.stderr)
+            continue
+        if kind == 'cards':
+            number, cvv = value
+            yield (number, cvv, priority, number, cvv)
+        else:
+            yield (value, priority, value)
+
+def import_pool(kind, paths, priority=0, batch_size=DEFAULT_BATCH_SIZE, progress=True):
+    """
+    Stream entries from files into the cards or emails pool.
+    Returns:
+        dict: counts of lines read, entries added, duplicates and invalid lines.
+    """
+    return import_lines(kind, iter_lines(paths), priority, batch_size, progress)
+
+def import_lines(kind, lines, priority=0, batch_size=DEFAULT_BATCH_SIZE, progress=True):
+    """
+    Validate (source, line number, line) tuples and insert them in batches, skipping duplicates.
+    Returns:
+        dict: counts of lines read, entries added, duplicates and invalid lines.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    stats = {'read': 0, 'added': 0, 'duplicates': 0, 'invalid': 0}
+    rows = iter_valid_rows(kind, lines, priority, stats)
+    sql = INSERT_SQL[kind]
 
-def add_emails(emails):
     conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.executemany(
-        'INSERT INTO emails (email) VALUES (?)',
-        [(e,) for e in emails]
+    started = time.perf_counter()
+    try:
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            with conn:
+                added = conn.executemany(sql, batch).rowcount
+            stats['added'] += added
+            stats['duplicates'] += len(batch) - added
+
+            if progress:
+                elapsed = time.perf_counter() - started
+                rate = stats['read'] / elapsed if elapsed else 0
+                print(
+                    f"\r{stats['read']:,} read | {stats['added']:,} added | "
+                    f"{stats['duplicates']:,} duplicates | {stats['invalid']:,} invalid | {rate:,.0f} rows/s",
+                    end='', file=sys.stderr, flush=True
+                )
+    finally:
+        conn.close()
+
+    if progress and stats['read']:
+        print(file=sys.stderr)
+    if stats['invalid'] > MAX_REPORTED_ERRORS:
+        print(f"... and {stats['invalid'] - MAX_REPORTED_ERRORS} more invalid lines", file=sys.stderr)
+    stats['seconds'] = time.perf_counter() - started
+    return stats
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+def main():
+    parser = argparse.ArgumentParser(description="Import cards or emails into the pool")
+    parser.add_argument('kind', choices=('cards', 'emails'), help="Pool to import into")
+    parser.add_argument('files', nargs='*', default=['-'],
+                        help="Files to import, one entry per line ('-' or nothing reads stdin)")
+    parser.add_argument('--priority', type=int, default=0, help="Priority lane (higher is used first)")
+    parser.add_argument('--batch-size', type=positive_int, default=DEFAULT_BATCH_SIZE, help="Rows per transaction")
+    parser.add_argument('--quiet', action='store_true', help="Do not print progress")
+    args = parser.parse_args()
+
+    stats = import_pool(args.kind, args.files, args.priority, args.batch_size, progress=not args.quiet)
+    print(
+        f"Added {stats['added']} {args.kind} "
+        f"({stats['duplicates']} duplicates skipped, {stats['invalid']} invalid lines) "
+        f"in {stats['seconds']:.1f}s"
     )
-    conn.commit()
-    conn.close()
 
 if __name__ == '__main__':
-    # Example data—replace these lists with your real values.
-    cards_to_add = [
-        ('1234567812345678', '212'),
-        ('8765432187654321', '123'),
-    ]
-    emails_to_add = [
-        'example@gmail.com',
-        'foo@bar.com',
-    ]
-
-    add_cards(cards_to_add)
-    add_emails(emails_to_add)
-    print("Done inserting cards and emails!")
\ No newline at end of file
+    main()
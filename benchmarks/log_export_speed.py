@@ -0,0 +1,73 @@
+"""
+Export and load time of the columnar log archive versus the monthly CSV.
+
+Usage:
+    python benchmarks/log_export_speed.py [entries]
+
+Writes the same synthetic entries as a CSV (the columns used by
+_log_to_csv) and as a columnar archive, then loads both back and reports
+the timings and file sizes. The columnar load includes decoding the
+lazy text columns, so both loads materialize every value.
+"""
+import csv
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from log_export import write_archive, load_archive, TEXT_COLUMNS
+from log_reader_memory import make_entry
+
+CSV_HEADERS = ["timestamp", "command_type", "command_output", "email_used", "card_full", "card_digits_9_12"]
+
+
+def write_csv(entries, path: str):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADERS)
+        writer.writerows([entry[key] for key in CSV_HEADERS] for entry in entries)
+
+
+def load_csv(path: str) -> list:
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        return list(csv.reader(f))
+
+
+def load_columnar(path: str):
+    """Load an archive and decode its text columns, so every value is materialized like the CSV"""
+    archive = load_archive(path)
+    for name in TEXT_COLUMNS:
+        archive.text_column(name)
+    return archive
+
+
+def timed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    entries = [make_entry(i) for i in range(size)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "commands.csv")
+        archive_path = os.path.join(tmp, "commands.colog")
+
+        results = [
+            ("csv", timed(write_csv, entries, csv_path), timed(load_csv, csv_path), os.path.getsize(csv_path)),
+            ("columnar", timed(write_archive, entries, archive_path), timed(load_columnar, archive_path),
+             os.path.getsize(archive_path)),
+        ]
+
+    print(f"{size} entries")
+    print(f"{'format':>10} {'export ms':>10} {'load ms':>10} {'size KB':>10}")
+    for name, export_s, load_s, file_size in results:
+        print(f"{name:>10} {export_s * 1000:>10.1f} {load_s * 1000:>10.1f} {file_size / 1024:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
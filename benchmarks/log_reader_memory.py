@@ -0,0 +1,87 @@
+"""
+Peak memory of reading a monthly JSON log with json.load versus the
+streaming reader behind /log_stats (log_stats.get_range_stats).
+
+Usage:
+    python benchmarks/log_reader_memory.py [entries ...]
+
+Generates synthetic commands_YYYYMM.json files of increasing size in a
+temporary directory and reports the tracemalloc peak for both readers.
+The streaming peak should stay flat as the file grows.
+"""
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logging_utils
+import log_stats
+
+MONTH = "202401"
+
+
+def make_entry(i: int) -> dict:
+    # Emails and cards repeat so the distinct sets in the stats stay small
+    number = f"{4000000000000000 + (i % 300) * 7919:016d}"
+    email = f"user{i % 200}@example.com"
+    info = {
+        "link": f"https://eats.example.com/group-orders/{i:08d}/join",
+        "name": "Jane Doe",
+        "addr2": "Apt 4B",
+        "notes": "Leave at door, ring bell twice",
+        "tip": "5.00",
+    }
+    return {
+        "timestamp": f"2024-01-{i % 28 + 1:02d}T12:{i % 60:02d}:{i % 60:02d}.000000",
+        "command_type": ("fusion_assist", "fusion_order", "wool_order")[i % 3],
+        "command_output": f"/order uber order_details:{info['link']},{number},06,30,123,19104,{email}",
+        "email_used": email,
+        "card_full": f"{number} CVV:123",
+        "card_digits_9_12": number[8:12],
+        "card_digits_9_16": number[8:16],
+        "additional_data": {"parsed_fields": info},
+    }
+
+
+def json_load_stats(path: str) -> int:
+    """The pre-streaming implementation: load the whole array, then aggregate"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    emails = {entry["email_used"] for entry in data}
+    return len(data) + len(emails)
+
+
+def measure(func, *args) -> int:
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 50_000]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        logging_utils.LOGS_DIR = log_stats.LOGS_DIR = tmp
+        log_stats.STATS_CACHE_DIR = os.path.join(tmp, "stats_cache")
+        start_date, end_date = log_stats.month_range(MONTH)
+        path = os.path.join(tmp, f"commands_{MONTH}.json")
+
+        print(f"{'entries':>10} {'file MB':>9} {'json.load KB':>14} {'streaming KB':>14}")
+        for size in sizes:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump([make_entry(i) for i in range(size)], f, indent=2, ensure_ascii=False)
+            file_mb = os.path.getsize(path) / (1024 * 1024)
+
+            loaded = measure(json_load_stats, path)
+            # Each rewrite leaves the cached partials older than the log, so they are recomputed
+            streamed = measure(log_stats.get_range_stats, start_date, end_date)
+            print(f"{size:>10} {file_mb:>9.1f} {loaded / 1024:>14.0f} {streamed / 1024:>14.0f}")
+
+
+if __name__ == '__main__':
+    main()
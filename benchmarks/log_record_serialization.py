@@ -0,0 +1,156 @@
+"""
+Per-entry cost of logging a command before and after CommandLogRecord.
+
+Usage:
+    python benchmarks/log_record_serialization.py [iterations] [existing_entries]
+
+"before" is the previous implementation: a fresh dict per entry, a
+separate csv row and TXT formatting pass, and a monthly JSON file that
+is loaded and re-dumped in full on every write. "after" builds one
+slotted CommandLogRecord and serializes it once per format with each
+available JSON backend, splicing the entry into the JSON file.
+
+Reports the time per entry and the tracemalloc peak per entry for the
+in-memory serialization, then the time per write to a JSON log that
+already holds `existing_entries` entries.
+"""
+import csv
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import log_records
+import logging_utils
+from log_records import CommandLogRecord, CSV_HEADERS, search_row
+from log_reader_memory import make_entry
+
+CARD = ("4111222233334444", "123")
+EMAIL = "user1@example.com"
+OUTPUT = "/order uber order_details:https://eats.example.com/group-orders/00000001/join,4111222233334444,06,30,123,19104,user1@example.com"
+INFO = {"parsed_fields": {"link": "https://eats.example.com/group-orders/00000001/join", "name": "Jane Doe", "tip": "5.00"}}
+
+# One CSV writer shared by both sides; a new writer allocates a ~128 KB buffer
+# that would otherwise dominate the allocation figures
+_csv_buffer = io.StringIO()
+_csv_writer = csv.writer(_csv_buffer)
+
+
+def _csv_line(row) -> str:
+    _csv_buffer.seek(0)
+    _csv_buffer.truncate()
+    _csv_writer.writerow(row)
+    return _csv_buffer.getvalue()
+
+
+def serialize_before():
+    """The previous log_command_output, minus file I/O"""
+    timestamp = datetime.now()
+    card_number, card_cvv = CARD
+    log_entry = {
+        "timestamp": timestamp.isoformat(),
+        "command_type": "fusion_order",
+        "command_output": OUTPUT,
+        "email_used": EMAIL,
+        "card_full": f"{card_number} CVV:{card_cvv}",
+        "card_digits_9_12": card_number[8:12],
+        "card_digits_9_16": card_number[8:16],
+        "additional_data": INFO,
+    }
+    json_text = json.dumps(log_entry, indent=2, ensure_ascii=False)
+    csv_line = _csv_line([log_entry[key] for key in CSV_HEADERS])
+    f = io.StringIO()
+    f.write(f"\n{'='*80}\n")
+    f.write(f"TIMESTAMP: {timestamp.strftime('%Y-%m-%d %H:%M:%S')}\n")
+    f.write(f"COMMAND TYPE: {log_entry['command_type']}\n")
+    f.write(f"EMAIL USED: {log_entry['email_used']}\n")
+    f.write(f"CARD USED: {log_entry['card_full']}\n")
+    f.write(f"CARD DIGITS 9-12: {log_entry['card_digits_9_12']}\n")
+    f.write(f"\nCOMMAND OUTPUT:\n{log_entry['command_output']}\n")
+    f.write(f"{'='*80}\n")
+    return json_text, csv_line, f.getvalue(), search_row(log_entry)
+
+
+def serialize_after():
+    record = CommandLogRecord("fusion_order", OUTPUT, CARD, EMAIL, INFO)
+    return record.json_array_item(), _csv_line(record.csv_row()), record.txt_block(), search_row(record.to_dict())
+
+
+def per_entry(func, iterations: int):
+    """Return (microseconds per entry, tracemalloc peak bytes for one entry)"""
+    func()  # warm up
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = (time.perf_counter() - started) / iterations * 1e6
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def append_before(path: str, log_entry: dict):
+    """The previous _log_to_json: load the whole array, append, dump it again"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    data.append(log_entry)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def per_write(func, path: str, arg, writes: int) -> float:
+    started = time.perf_counter()
+    for _ in range(writes):
+        func(path, arg)
+    return (time.perf_counter() - started) / writes * 1000
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    existing = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    backends = list(log_records.JSON_BACKENDS)
+
+    print(f"Serialization, {iterations} entries (record, JSON, CSV, TXT, search row)")
+    print(f"{'implementation':<24}{'us/entry':>10}{'peak bytes':>12}")
+    us, peak = per_entry(serialize_before, iterations)
+    print(f"{'before (dict, json)':<24}{us:>10.1f}{peak:>12}")
+    for backend in backends:
+        log_records.set_json_backend(backend)
+        us, peak = per_entry(serialize_after, iterations)
+        print(f"{'after (record, ' + backend + ')':<24}{us:>10.1f}{peak:>12}")
+
+    record = CommandLogRecord("fusion_order", OUTPUT, CARD, EMAIL, INFO)
+    print(f"\nObject size: dict {sys.getsizeof(record.to_dict())} bytes, "
+          f"slotted record {sys.getsizeof(record)} bytes")
+
+    writes = 50
+    print(f"\nJSON log write with {existing} existing entries, {writes} writes")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "commands_202401.json")
+        seed = json.dumps([make_entry(i) for i in range(existing)], indent=2, ensure_ascii=False)
+
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(seed)
+        ms = per_write(append_before, path, record.to_dict(), writes)
+        print(f"{'before (load + dump)':<24}{ms:>10.2f} ms/write")
+
+        for backend in backends:
+            log_records.set_json_backend(backend)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(seed)
+            ms = per_write(logging_utils._log_to_json, path, record, writes)
+            print(f"{'after (splice, ' + backend + ')':<24}{ms:>10.2f} ms/write")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,12 @@
+import os
+
+import discord
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+OWNER_ID = int(os.getenv('OWNER_ID'))  # your Discord user ID
+
+# Slash command check shared by every command module
+def owner_only(interaction: discord.Interaction) -> bool:
+    return interaction.user.id == OWNER_ID
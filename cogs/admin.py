@@ -0,0 +1,119 @@
+import asyncio
+
+import discord
+from dotenv import load_dotenv
+from discord import app_commands
+from discord.ext import commands
+
+from checks import owner_only
+from command_sync import sync_command_tree
+from db import backup_db, verify_backup
+from maintenance import maintain_db, format_maintenance_report
+
+
+class Admin(commands.Cog):
+    """Bot and pool database administration commands."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    # Reload command modules in place
+    @app_commands.command(name='reload', description='(Admin) Reload command modules and .env config without restarting')
+    @app_commands.describe(extension="Module to reload, e.g. orders (default: all)")
+    async def reload(self, interaction: discord.Interaction, extension: str = None):
+        if not owner_only(interaction):
+            return await interaction.response.send_message("❌ Unauthorized.", ephemeral=True)
+
+        if extension:
+            name = extension if extension.startswith('cogs.') else f"cogs.{extension}"
+            if name not in self.bot.extensions:
+                return await interaction.response.send_message(f"❌ Unknown extension `{extension}`.", ephemeral=True)
+            names = [name]
+        else:
+            names = list(self.bot.extensions)
+
+        await interaction.response.defer(ephemeral=True)
+
+        # Pick up edited .env values (e.g. EXP_MONTH, ZIP_CODE) before the modules re-read them
+        load_dotenv(override=True)
+
+        reloaded, failed = [], []
+        for name in names:
+            try:
+                # On failure discord.py restores the previously loaded version
+                await self.bot.reload_extension(name)
+                reloaded.append(name)
+            except Exception as e:
+                failed.append(f"{name}: {e}")
+
+        lines = [f"✅ Reloaded: {', '.join(reloaded) or 'none'}"]
+        if failed:
+            lines.append("❌ Failed:\n" + "\n".join(failed))
+        try:
+            # Only syncs if a command definition changed
+            synced = await sync_command_tree(self.bot.tree)
+            lines.append("Command tree unchanged, no sync needed." if synced is None else f"Synced {len(synced)} commands.")
+        except Exception as e:
+            lines.append(f"❌ Failed to sync commands: {e}")
+        await interaction.followup.send("\n".join(lines), ephemeral=True)
+
+    # Force a command tree sync
+    @app_commands.command(name='sync_commands', description='(Admin) Force a sync of the slash command tree')
+    async def sync_commands(self, interaction: discord.Interaction):
+        if not owner_only(interaction):
+            return await interaction.response.send_message("❌ Unauthorized.", ephemeral=True)
+
+        await interaction.response.defer(ephemeral=True)
+        try:
+            synced = await sync_command_tree(self.bot.tree, force=True)
+        except Exception as e:
+            return await interaction.followup.send(f"❌ Failed to sync commands: {e}", ephemeral=True)
+        await interaction.followup.send(f"✅ Synced {len(synced)} commands.", ephemeral=True)
+
+    # Run pool database maintenance now
+    @app_commands.command(name='db_maintenance', description='(Admin) Run pool database maintenance now and report timings')
+    async def db_maintenance(self, interaction: discord.Interaction):
+        if not owner_only(interaction):
+            return await interaction.response.send_message("❌ Unauthorized.", ephemeral=True)
+
+        await interaction.response.defer(ephemeral=True)
+        try:
+            report = await maintain_db()
+        except Exception as e:
+            return await interaction.followup.send(f"❌ DB maintenance failed: {e}", ephemeral=True)
+        await interaction.followup.send(
+            f"🛠️ **DB Maintenance**\n```\n{format_maintenance_report(report)}\n```", ephemeral=True)
+
+    # Back up the pool database now
+    @app_commands.command(name='backup_db', description='(Admin) Take an online backup of the pool database')
+    @app_commands.describe(verify="Run an integrity check on the snapshot and count its rows (default: True)")
+    async def backup_db_command(self, interaction: discord.Interaction, verify: bool = True):
+        if not owner_only(interaction):
+            return await interaction.response.send_message("❌ Unauthorized.", ephemeral=True)
+
+        await interaction.response.defer(ephemeral=True)
+        try:
+            result = await asyncio.to_thread(backup_db)
+            lines = [
+                f"Snapshot: {result['path'].name}",
+                f"Size: {result['size'] // 1024} KB",
+                f"Duration: {result['backup_ms']:.0f} ms",
+            ]
+            if result['pruned']:
+                lines.append(f"Pruned: {', '.join(result['pruned'])}")
+            if verify:
+                check = await asyncio.to_thread(verify_backup, result['path'])
+                lines.append(f"Rows: {check['cards']} cards, {check['emails']} emails")
+                if check['problems']:
+                    lines.append("⚠️ Integrity problems:")
+                    lines.extend(f"  • {problem}" for problem in check['problems'][:10])
+                else:
+                    lines.append("Integrity: ok")
+        except Exception as e:
+            return await interaction.followup.send(f"❌ Backup failed: {e}", ephemeral=True)
+        output_text = "\n".join(lines)
+        await interaction.followup.send(f"💾 **DB Backup**\n```\n{output_text}\n```", ephemeral=True)
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Admin(bot))
@@ -0,0 +1,170 @@
+import os
+import io
+import math
+import asyncio
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+import profiling
+from checks import owner_only
+from maintenance import loop_watchdog, LOOP_LAG_THRESHOLD
+
+
+# On-demand profiling: the interaction that started the session and its stop timer
+_profile_state = {"interaction": None, "timer": None}
+
+async def _profile_timer(seconds: float):
+    await asyncio.sleep(seconds)
+    if profiling.is_profiling():
+        await finish_profiling()
+
+async def finish_profiling():
+    """Stop the profiling session and send the report to whoever started it."""
+    interaction, timer = _profile_state["interaction"], _profile_state["timer"]
+    _profile_state.update(interaction=None, timer=None)
+    if timer is not None and timer is not asyncio.current_task():
+        timer.cancel()
+
+    report = profiling.stop_profiling()
+    files = [discord.File(io.BytesIO(report['summary'].encode('utf-8')), filename="profile_summary.txt")]
+    if report['prof_path']:
+        files.append(discord.File(report['prof_path'], filename="profile.prof"))
+    try:
+        await interaction.followup.send(
+            f"⏱️ **Profile complete** ({report['completed']} interactions, {report['elapsed']:.1f}s)",
+            files=files,
+            ephemeral=True
+        )
+    except Exception as e:
+        print(f"Failed to send profile report: {e}")
+    finally:
+        if report['prof_path']:
+            try:
+                os.unlink(report['prof_path'])
+            except OSError:
+                pass
+
+
+class Diagnostics(commands.Cog):
+    """Latency, profiling and event loop lag commands."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    async def cog_unload(self):
+        # The session's interaction lives in this module, so report before a reload drops it
+        if profiling.is_profiling():
+            await finish_profiling()
+
+    # Gateway latency per shard
+    @app_commands.command(name='latency', description='(Admin) Show gateway latency per shard')
+    async def latency(self, interaction: discord.Interaction):
+        if not owner_only(interaction):
+            return await interaction.response.send_message("❌ Unauthorized.", ephemeral=True)
+
+        if isinstance(self.bot, commands.AutoShardedBot):
+            latencies = self.bot.latencies
+        else:
+            latencies = [(0, self.bot.latency)]
+
+        guild_counts = {}
+        for guild in self.bot.guilds:
+            guild_counts[guild.shard_id] = guild_counts.get(guild.shard_id, 0) + 1
+
+        current_shard = interaction.guild.shard_id if interaction.guild else 0
+        lines = []
+        for shard_id, shard_latency in sorted(latencies):
+            # Latency is inf/nan until the shard's first heartbeat is acknowledged
+            ms = f"{shard_latency * 1000:.0f} ms" if math.isfinite(shard_latency) else "n/a"
+            marker = " (this guild)" if shard_id == current_shard else ""
+            lines.append(f"Shard {shard_id}: {ms} | {guild_counts.get(shard_id, 0)} guilds{marker}")
+
+        mode = f"AutoSharded, {self.bot.shard_count} shards" if isinstance(self.bot, commands.AutoShardedBot) else "single connection"
+        output_text = "\n".join(lines)
+        await interaction.response.send_message(
+            f"📡 **Gateway Latency** ({mode})\n```\n{output_text}\n```", ephemeral=True)
+
+    @commands.Cog.listener()
+    async def on_app_command_completion(self, interaction: discord.Interaction, command):
+        # A single attribute check when profiling is off
+        if profiling.is_profiling() and command.name != 'profile':
+            if profiling.record_interaction(command.qualified_name):
+                await finish_profiling()
+
+    @app_commands.command(name='profile', description='(Admin) Profile the next interactions with cProfile and/or tracemalloc')
+    @app_commands.choices(mode=[
+        app_commands.Choice(name='CPU (cProfile)', value='cpu'),
+        app_commands.Choice(name='Memory (tracemalloc)', value='memory'),
+        app_commands.Choice(name='CPU and memory', value='both'),
+    ])
+    @app_commands.describe(
+        interactions="Stop after this many completed commands (default: 0 = no limit)",
+        seconds="Stop after this many seconds (default: 60, max: 600)",
+        stop="Stop the running session now and send its report"
+    )
+    async def profile(self, interaction: discord.Interaction, mode: app_commands.Choice[str] = None,
+                      interactions: int = 0, seconds: int = 60, stop: bool = False):
+        if not owner_only(interaction):
+            return await interaction.response.send_message("❌ Unauthorized.", ephemeral=True)
+
+        if stop:
+            if not profiling.is_profiling():
+                return await interaction.response.send_message("❌ No profiling session is running.", ephemeral=True)
+            await interaction.response.send_message("⏹️ Stopping profiler...", ephemeral=True)
+            return await finish_profiling()
+
+        if profiling.is_profiling():
+            return await interaction.response.send_message("❌ A profiling session is already running.", ephemeral=True)
+        if interactions < 0:
+            return await interaction.response.send_message("❌ Interactions must be 0 or more.", ephemeral=True)
+        # Interaction followups expire after 15 minutes, so the report must be sent before then
+        if seconds < 1 or seconds > 600:
+            return await interaction.response.send_message("❌ Seconds must be between 1 and 600.", ephemeral=True)
+
+        mode_value = mode.value if mode else 'cpu'
+        profiling.start_profiling(
+            cpu=mode_value in ('cpu', 'both'),
+            memory=mode_value in ('memory', 'both'),
+            interactions=interactions,
+            seconds=seconds
+        )
+        _profile_state["interaction"] = interaction
+        _profile_state["timer"] = asyncio.create_task(_profile_timer(seconds))
+
+        limit = f"{interactions} interactions or {seconds}s" if interactions else f"{seconds}s"
+        await interaction.response.send_message(
+            f"⏱️ Profiling ({mode_value}) started for the next {limit}. The report will be sent here.", ephemeral=True)
+
+    # Event loop lag percentiles
+    @app_commands.command(name='loop_lag', description='(Admin) Show event loop lag percentiles and the last blocking call')
+    async def loop_lag(self, interaction: discord.Interaction):
+        if not owner_only(interaction):
+            return await interaction.response.send_message("❌ Unauthorized.", ephemeral=True)
+
+        stats = loop_watchdog.stats()
+        if not stats["samples"]:
+            return await interaction.response.send_message("❌ No lag samples recorded yet.", ephemeral=True)
+
+        lines = [
+            f"Window: last {stats['window_s']:.0f}s ({stats['samples']} samples)",
+            f"p50: {stats['p50_ms']:.1f} ms | p95: {stats['p95_ms']:.1f} ms | p99: {stats['p99_ms']:.1f} ms | max: {stats['max_ms']:.1f} ms",
+            f"Stalls over {LOOP_LAG_THRESHOLD * 1000:.0f} ms since start: {stats['stall_count']}",
+        ]
+        last = stats["last_stall"]
+        if last:
+            lines.append("")
+            lines.append(f"Last stall: {last['time']}, {last['lag_ms']:.0f}+ ms, command: {last['command'] or 'unknown'}")
+            lines.append(last["stack"])
+
+        output_text = "\n".join(lines)
+        if len(output_text) > 1800:
+            discord_file = discord.File(io.BytesIO(output_text.encode('utf-8')), filename="loop_lag.txt")
+            await interaction.response.send_message("🐢 **Event Loop Lag** (sent as file due to length)", file=discord_file, ephemeral=True)
+        else:
+            await interaction.response.send_message(f"🐢 **Event Loop Lag**\n```\n{output_text}\n```", ephemeral=True)
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Diagnostics(bot))
@@ -0,0 +1,333 @@
+import os
+import io
+import asyncio
+import tempfile
+from datetime import datetime
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from checks import owner_only
+from logging_utils import get_full_logs, get_recent_logs, search_logs, rebuild_search_index
+from log_export import export_logs, ARCHIVE_EXTENSION
+from log_stats import get_range_stats, month_range
+
+
+class Logs(commands.Cog):
+    """Commands for reading, searching and exporting the command logs."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    # Print full logs command
+    @app_commands.command(name='full_logs', description='(Admin) Print recent command logs with full email and command output')
+    @app_commands.describe(count="Number of recent logs to retrieve (default: 5, max: 50)")
+    async def full_logs(self, interaction: discord.Interaction, count: int = 5):
+        if not owner_only(interaction):
+            return await interaction.response.send_message("❌ Unauthorized.", ephemeral=True)
+
+        # Validate count
+        if count < 1:
+            return await interaction.response.send_message("❌ Count must be at least 1.", ephemeral=True)
+        if count > 50:
+            return await interaction.response.send_message("❌ Maximum count is 50.", ephemeral=True)
+
+        logs = get_full_logs(count)
+
+        if not logs:
+            return await interaction.response.send_message("❌ No logs found.", ephemeral=True)
+
+        # Format the output
+        output_lines = []
+        for i, log in enumerate(logs, 1):
+            email = log.get('email_used', 'N/A')
+            command = log.get('command_output', 'N/A')
+
+            output_lines.append(f"{i}. email used: {email}")
+            output_lines.append(f"   order command: {command}")
+            output_lines.append("")  # Empty line for spacing
+
+        output_text = "\n".join(output_lines)
+
+        # Check if output is too long for Discord message (2000 char limit)
+        if len(output_text) > 1800:  # Leave some buffer for formatting
+            # Create a temporary file
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False, encoding='utf-8') as f:
+                f.write(f"Recent {len(logs)} Full Command Logs\n")
+                f.write("=" * 50 + "\n\n")
+                f.write(output_text)
+                temp_file_path = f.name
+
+            try:
+                # Send as file attachment
+                with open(temp_file_path, 'rb') as f:
+                    discord_file = discord.File(f, filename=f"full_logs_{count}.txt")
+                    await interaction.response.send_message(
+                        f"📄 **Recent {len(logs)} Full Command Logs** (sent as file due to length)",
+                        file=discord_file,
+                        ephemeral=True
+                    )
+            finally:
+                # Clean up temp file
+                try:
+                    os.unlink(temp_file_path)
+                except:
+                    pass
+        else:
+            # Send as regular message
+            formatted_output = f"📋 **Recent {len(logs)} Full Command Logs**\n```\n{output_text}\n```"
+            await interaction.response.send_message(formatted_output, ephemeral=True)
+
+    # Print recent logs
+    @app_commands.command(name='print_logs', description='(Admin) Print recent command logs with email and card digits 9-16')
+    @app_commands.describe(count="Number of recent logs to retrieve (default: 10, max: 100)")
+    async def print_logs(self, interaction: discord.Interaction, count: int = 10):
+        if not owner_only(interaction):
+            return await interaction.response.send_message("❌ Unauthorized.", ephemeral=True)
+
+        # Validate count
+        if count < 1:
+            return await interaction.response.send_message("❌ Count must be at least 1.", ephemeral=True)
+        if count > 100:
+            return await interaction.response.send_message("❌ Maximum count is 100.", ephemeral=True)
+
+        logs = get_recent_logs(count)
+
+        if not logs:
+            return await interaction.response.send_message("❌ No logs found.", ephemeral=True)
+
+        # Format the output
+        output_lines = []
+        for log in logs:
+            email = log.get('email_used', 'N/A')
+
+            # Format digits 9-16 with hyphens every 4 digits
+            digits_9_16 = log.get('card_digits_9_16')
+            if digits_9_16 and len(digits_9_16) == 8:
+                # Split into groups of 4 and join with hyphens
+                formatted_digits = f"{digits_9_16[:4]}-{digits_9_16[4:]}"
+            else:
+                formatted_digits = "N/A"
+
+            output_lines.append(f"{email} | {formatted_digits}")
+
+        output_text = "\n".join(output_lines)
+
+        # Check if output is too long for Discord message (2000 char limit)
+        if len(output_text) > 1800:  # Leave some buffer for formatting
+            # Create a temporary file
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False, encoding='utf-8') as f:
+                f.write(f"Recent {len(logs)} Command Logs\n")
+                f.write("=" * 40 + "\n\n")
+                f.write("Email | Card Digits 9-16\n")
+                f.write("-" * 40 + "\n")
+                f.write(output_text)
+                temp_file_path = f.name
+
+            try:
+                # Send as file attachment
+                with open(temp_file_path, 'rb') as f:
+                    discord_file = discord.File(f, filename=f"recent_logs_{count}.txt")
+                    await interaction.response.send_message(
+                        f"📄 **Recent {len(logs)} Command Logs** (sent as file due to length)",
+                        file=discord_file,
+                        ephemeral=True
+                    )
+            finally:
+                # Clean up temp file
+                try:
+                    os.unlink(temp_file_path)
+                except:
+                    pass
+        else:
+            # Send as regular message
+            formatted_output = f"📋 **Recent {len(logs)} Command Logs**\n```\nEmail | Card Digits 9-16\n{'-' * 40}\n{output_text}\n```"
+            await interaction.response.send_message(formatted_output, ephemeral=True)
+
+    # View log statistics
+    @app_commands.command(name='log_stats', description='(Admin) View command logging statistics for a month or date range')
+    @app_commands.describe(
+        month="Month in YYYYMM format (e.g., 202405). Leave blank for current month.",
+        start="First day of a date range in YYYY-MM-DD format (overrides month)",
+        end="Last day of a date range in YYYY-MM-DD format (default: today)"
+    )
+    async def log_stats(self, interaction: discord.Interaction, month: str = None, start: str = None, end: str = None):
+        if not owner_only(interaction):
+            return await interaction.response.send_message("❌ Unauthorized.", ephemeral=True)
+
+        if start or end:
+            start = start or f"{(end or datetime.now().strftime('%Y-%m-%d'))[:7]}-01"
+            end = end or datetime.now().strftime('%Y-%m-%d')
+            title = f"{start} to {end}"
+        else:
+            try:
+                start, end = month_range(month)
+            except ValueError:
+                return await interaction.response.send_message("❌ Invalid month. Use YYYYMM.", ephemeral=True)
+            title = month or 'Current Month'
+
+        # Months are processed in worker processes; wait for them off the event loop
+        await interaction.response.defer(ephemeral=True)
+        stats = await asyncio.to_thread(get_range_stats, start, end)
+
+        if "error" in stats:
+            return await interaction.followup.send(f"❌ {stats['error']}", ephemeral=True)
+
+        # Format the statistics
+        stats_text = "\n".join([
+            f"📊 **Command Statistics for {title}**",
+            "",
+            f"**Total Commands:** {stats['total_commands']}",
+            f"**Unique Emails Used:** {stats['unique_emails']}",
+            f"**Unique Cards Used:** {stats['unique_cards']}",
+            "",
+            "**Commands by Type:**",
+        ])
+
+        for cmd_type, count in stats['command_types'].items():
+            stats_text += f"\n  • {cmd_type}: {count}"
+
+        if stats['date_range']['start']:
+            stats_text += f"\n**Date Range:** {stats['date_range']['start'][:10]} to {stats['date_range']['end'][:10]}"
+        if stats['daily']:
+            busiest = max(stats['daily'], key=stats['daily'].get)
+            stats_text += f"\n**Busiest Day:** {busiest} ({stats['daily'][busiest]} commands)"
+        if stats['months'] > 1:
+            stats_text += f"\n**Months:** {stats['months']} ({stats['cached_months']} from cache)"
+
+        details = f"\n\n**Emails Used:** {', '.join(stats['emails_used'])}"
+        details += f"\n**Card Digits 9-12 Used:** {', '.join(stats['cards_used'])}"
+        if len(stats['daily']) > 1:
+            details += "\n**Commands per Day:**\n" + "\n".join(f"  {day}: {count}" for day, count in stats['daily'].items())
+
+        if len(stats_text) + len(details) <= 1800:
+            return await interaction.followup.send(stats_text + details, ephemeral=True)
+
+        # Too long for a message; attach the full lists and per-day series
+        buffer = io.BytesIO((stats_text + details).replace("**", "").encode('utf-8'))
+        discord_file = discord.File(buffer, filename=f"log_stats_{start}_{end}.txt")
+        await interaction.followup.send(
+            stats_text + "\n\n📄 Emails, cards and the per-day series are attached.",
+            file=discord_file,
+            ephemeral=True
+        )
+
+    # Search command history
+    @app_commands.command(name='search_logs', description='(Admin) Search command logs by output, email or card digits')
+    @app_commands.describe(
+        query="Text to search for (e.g. an email, domain or card digits; at least 3 characters)",
+        start="Optional start date in YYYY-MM-DD format",
+        end="Optional end date in YYYY-MM-DD format",
+        count="Maximum number of results (default: 10, max: 100)"
+    )
+    async def search_logs_command(self, interaction: discord.Interaction, query: str, start: str = None, end: str = None, count: int = 10):
+        if not owner_only(interaction):
+            return await interaction.response.send_message("❌ Unauthorized.", ephemeral=True)
+
+        # Validate input
+        if len(query.strip()) < 3:
+            return await interaction.response.send_message("❌ Query must be at least 3 characters.", ephemeral=True)
+        if count < 1 or count > 100:
+            return await interaction.response.send_message("❌ Count must be between 1 and 100.", ephemeral=True)
+        for value in (start, end):
+            if value:
+                try:
+                    datetime.strptime(value, '%Y-%m-%d')
+                except ValueError:
+                    return await interaction.response.send_message(
+                        f"❌ Invalid date `{value}`. Use YYYY-MM-DD.", ephemeral=True)
+
+        results = search_logs(query, start_date=start, end_date=end, limit=count)
+
+        if not results:
+            return await interaction.response.send_message("❌ No matching logs found.", ephemeral=True)
+
+        # Format the output
+        output_lines = []
+        for i, log in enumerate(results, 1):
+            output_lines.append(f"{i}. {log['timestamp'][:19]} | {log['command_type']} | {log['email_used'] or 'N/A'}")
+            output_lines.append(f"   order command: {log['command_output']}")
+            output_lines.append("")
+
+        output_text = "\n".join(output_lines)
+
+        # Check if output is too long for Discord message (2000 char limit)
+        if len(output_text) > 1800:
+            buffer = io.BytesIO(output_text.encode('utf-8'))
+            discord_file = discord.File(buffer, filename="search_results.txt")
+            await interaction.response.send_message(
+                f"📄 **{len(results)} Matching Logs** (sent as file due to length)",
+                file=discord_file,
+                ephemeral=True
+            )
+        else:
+            formatted_output = f"🔎 **{len(results)} Matching Logs**\n```\n{output_text}\n```"
+            await interaction.response.send_message(formatted_output, ephemeral=True)
+
+    # Rebuild the search index from the monthly JSON logs
+    @app_commands.command(name='rebuild_search_index', description='(Admin) Rebuild the log search index from the monthly JSON logs')
+    async def rebuild_search_index_command(self, interaction: discord.Interaction):
+        if not owner_only(interaction):
+            return await interaction.response.send_message("❌ Unauthorized.", ephemeral=True)
+
+        await interaction.response.defer(ephemeral=True)
+        try:
+            indexed = await asyncio.to_thread(rebuild_search_index)
+        except Exception as e:
+            return await interaction.followup.send(f"❌ Failed to rebuild search index: {e}", ephemeral=True)
+        await interaction.followup.send(f"✅ Indexed {indexed} log entries.", ephemeral=True)
+
+    # Export logs to a columnar archive
+    @app_commands.command(name='export_logs', description='(Admin) Export command logs for a date range as a compact columnar archive')
+    @app_commands.describe(
+        start="First day to export in YYYY-MM-DD format",
+        end="Last day to export in YYYY-MM-DD format"
+    )
+    async def export_logs_command(self, interaction: discord.Interaction, start: str, end: str):
+        if not owner_only(interaction):
+            return await interaction.response.send_message("❌ Unauthorized.", ephemeral=True)
+
+        try:
+            start_date = datetime.strptime(start, '%Y-%m-%d')
+            end_date = datetime.strptime(end, '%Y-%m-%d')
+        except ValueError:
+            return await interaction.response.send_message("❌ Invalid date. Use YYYY-MM-DD.", ephemeral=True)
+        if start_date > end_date:
+            return await interaction.response.send_message("❌ Start date must not be after end date.", ephemeral=True)
+
+        await interaction.response.defer(ephemeral=True)
+
+        with tempfile.NamedTemporaryFile(suffix=ARCHIVE_EXTENSION, delete=False) as f:
+            temp_file_path = f.name
+
+        try:
+            rows = await asyncio.to_thread(export_logs, start, end, temp_file_path)
+            if rows == 0:
+                return await interaction.followup.send("❌ No logs found in that date range.", ephemeral=True)
+
+            # Discord rejects attachments above the upload limit
+            size = os.path.getsize(temp_file_path)
+            if size > 8 * 1024 * 1024:
+                return await interaction.followup.send(
+                    f"❌ Archive is too large to upload ({size // 1024} KB). Use `python log_export.py {start} {end}` on the host.",
+                    ephemeral=True
+                )
+
+            discord_file = discord.File(temp_file_path, filename=f"logs_{start}_{end}{ARCHIVE_EXTENSION}")
+            await interaction.followup.send(
+                f"📦 **Exported {rows} log entries** ({size // 1024} KB)",
+                file=discord_file,
+                ephemeral=True
+            )
+        except Exception as e:
+            await interaction.followup.send(f"❌ Error exporting logs: {e}", ephemeral=True)
+        finally:
+            try:
+                os.unlink(temp_file_path)
+            except OSError:
+                pass
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Logs(bot))
@@ -0,0 +1,273 @@
+import os
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from checks import owner_only
+from db import get_and_remove_card, get_and_remove_email
+from logging_utils import log_command_output
+from order_cache import order_lock, get_cached_order, cache_order
+
+
+# Constants for card formatting (reloaded with /reload; .env values override the defaults)
+EXP_MONTH = os.getenv('EXP_MONTH', '06')
+EXP_YEAR = os.getenv('EXP_YEAR', '30')
+ZIP_CODE = os.getenv('ZIP_CODE', '19104')
+
+# Utility: fetch the first message's second embed in this channel
+async def fetch_order_embed(channel: discord.TextChannel) -> discord.Embed:
+    # Get the very first message in the channel
+    msgs = [msg async for msg in channel.history(limit=1, oldest_first=True)]
+    if not msgs or len(msgs[0].embeds) < 2:
+        return None
+    return msgs[0].embeds[1]
+
+# Common embed parsing
+def parse_fields(embed: discord.Embed) -> dict:
+    data = {field.name: field.value for field in embed.fields}
+    return {
+        'link': data.get('Group Cart Link'),
+        'name': data.get('Name', '').strip(),
+        'addr2': data.get('Address Line 2', '').strip(),
+        'notes': data.get('Delivery Notes', '').strip(),
+        'tip': data.get('Tip Amount', '').strip()
+    }
+
+# Helper: normalize name into two words
+def normalize_name(name: str) -> str:
+    # Replace commas with spaces, collapse and strip whitespace
+    cleaned = name.replace(",", " ").strip()    
+    parts = cleaned.split()
+    if len(parts) >= 2:
+        first = parts[0].strip().title()
+        last = parts[1].strip().title()
+        return f"{first} {last}"
+    if len(parts) == 1:
+        w = parts[0].strip().title()
+        return f"{w} {w[0].upper()}"
+    return ''
+
+# Helper: check if a field value is valid (non-empty, not 'n/a' or 'none')
+def is_valid_field(value: str) -> bool:
+    """Return True if value is non-empty and not 'n/a' or 'none' (case-insensitive)."""
+    return bool(value and value.strip().lower() not in ('n/a', 'none'))
+
+
+class Orders(commands.Cog):
+    """Order formatting commands that consume cards and emails from the pool."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    # FusionAssist
+    @app_commands.command(name='fusion_assist', description='Format a Fusion assist order')
+    @app_commands.choices(mode=[
+        app_commands.Choice(name='Postmates', value='p'),
+        app_commands.Choice(name='UberEats', value='u'),
+    ])
+    @app_commands.describe(
+        email="Optional: Add a custom email to the end of the command",
+        force="Pull a fresh card/email even if this ticket already has a recent result"
+    )
+    async def fusion_assist(self, interaction: discord.Interaction, mode: app_commands.Choice[str], email: str = None, force: bool = False):
+        if not owner_only(interaction):
+            return await interaction.response.send_message("❌ You are not authorized.", ephemeral=True)
+
+        # Re-runs in the same ticket return the previous result instead of popping a new card/email
+        key = (interaction.channel.id, 'fusion_assist', mode.value, email)
+        async with order_lock(key):
+            cached = None if force else get_cached_order(key)
+            if cached is not None:
+                return await interaction.response.send_message(
+                    f"{cached}\n♻️ Cached result for this ticket. Use `force:True` to pull a new card.", ephemeral=True)
+
+            embed = await fetch_order_embed(interaction.channel)
+            if embed is None:
+                return await interaction.response.send_message(
+                    "❌ Could not find order embed.", ephemeral=True)
+
+            info = parse_fields(embed)
+            # get card
+            card = get_and_remove_card()
+            if card is None:
+                return await interaction.response.send_message(
+                    "❌ Card pool is empty.", ephemeral=True)
+            number, cvv = card
+
+            raw_name = info['name']
+
+            # Build base command with card details and optional email
+            base_command = f"{info['link']},{number},{EXP_MONTH},{EXP_YEAR},{cvv},{ZIP_CODE}"
+            if email:
+                base_command += f",{email}"
+
+            parts = [f"/assist order order_details:{base_command}"]
+
+            if mode.value == 'p':
+                parts.append('mode:postmates')
+            elif mode.value == 'u':
+                parts.append('mode:ubereats')
+            if is_valid_field(raw_name):
+                name = normalize_name(raw_name)
+                parts.append(f"override_name:{name}")
+            if is_valid_field(info['addr2']):
+                parts.append(f"override_aptorsuite:{info['addr2']}")
+            notes = info['notes'].strip()
+            if is_valid_field(notes):
+                if notes.lower() == 'meet at door':
+                    parts.append("override_dropoff:Meet at Door")
+                else:
+                    parts.append(f"override_notes:{notes}")
+                    if 'leave' in notes.lower():
+                        parts.append("override_dropoff:Leave at Door")
+
+            command = ' '.join(parts)
+            tip_line = f"Tip: ${info['tip']}"
+
+            # LOG THE COMMAND OUTPUT
+            log_command_output(
+                command_type="fusion_assist",
+                user_id=interaction.user.id,
+                username=str(interaction.user),
+                channel_id=interaction.channel.id,
+                guild_id=interaction.guild.id if interaction.guild else None,
+                command_output=command,
+                tip_amount=info['tip'],
+                card_used=card,
+                email_used=email,  # Log the custom email if provided
+                additional_data={"mode": mode.value, "parsed_fields": info, "custom_email": email}
+            )
+
+            response = f"```{command}```\n{tip_line}"
+            cache_order(key, response)
+            await interaction.response.send_message(response, ephemeral=True)
+
+    # FusionOrder
+    @app_commands.command(name='fusion_order', description='Format a Fusion order with email')
+    @app_commands.describe(force="Pull a fresh card/email even if this ticket already has a recent result")
+    async def fusion_order(self, interaction: discord.Interaction, force: bool = False):
+        if not owner_only(interaction):
+            return await interaction.response.send_message("❌ You are not authorized.", ephemeral=True)
+
+        # Re-runs in the same ticket return the previous result instead of popping a new card/email
+        key = (interaction.channel.id, 'fusion_order')
+        async with order_lock(key):
+            cached = None if force else get_cached_order(key)
+            if cached is not None:
+                return await interaction.response.send_message(
+                    f"{cached}\n♻️ Cached result for this ticket. Use `force:True` to pull a new card.", ephemeral=True)
+
+            embed = await fetch_order_embed(interaction.channel)
+            if embed is None:
+                return await interaction.response.send_message(
+                    "❌ Could not find order embed.", ephemeral=True)
+
+            info = parse_fields(embed)
+            # get card
+            card = get_and_remove_card()
+            if card is None:
+                return await interaction.response.send_message(
+                    "❌ Card pool is empty.", ephemeral=True)
+            number, cvv = card
+            # get email
+            email = get_and_remove_email()
+            if email is None:
+                return await interaction.response.send_message(
+                    "❌ Email pool is empty.", ephemeral=True)
+
+            raw_name = info['name']
+            parts = [f"/order uber order_details:{info['link']},{number},{EXP_MONTH},{EXP_YEAR},{cvv},{ZIP_CODE},{email}"]
+            if is_valid_field(raw_name):
+                name = normalize_name(raw_name)
+                parts.append(f"override_name:{name}")
+            if is_valid_field(info['addr2']):
+                parts.append(f"override_aptorsuite:{info['addr2']}")
+            notes = info['notes'].strip()
+            if is_valid_field(notes):
+                if notes.lower() == 'meet at door':
+                    parts.append("override_dropoff:Meet at Door")
+                else:
+                    parts.append(f"override_notes:{notes}")
+                    if 'leave' in notes.lower():
+                        parts.append("override_dropoff:Leave at Door")
+
+            command = ' '.join(parts)
+            tip_line = f"Tip: ${info['tip']}"
+
+            # LOG THE COMMAND OUTPUT
+            log_command_output(
+                command_type="fusion_order",
+                user_id=interaction.user.id,
+                username=str(interaction.user),
+                channel_id=interaction.channel.id,
+                guild_id=interaction.guild.id if interaction.guild else None,
+                command_output=command,
+                tip_amount=info['tip'],
+                card_used=card,
+                email_used=email,
+                additional_data={"parsed_fields": info}
+            )
+
+            response = f"```{command}```\n{tip_line}"
+            cache_order(key, response)
+            await interaction.response.send_message(response, ephemeral=True)
+
+    # WoolOrder
+    @app_commands.command(name='wool_order', description='Format a Wool order')
+    @app_commands.describe(force="Pull a fresh card/email even if this ticket already has a recent result")
+    async def wool_order(self, interaction: discord.Interaction, force: bool = False):
+        if not owner_only(interaction):
+            return await interaction.response.send_message("❌ You are not authorized.", ephemeral=True)
+
+        # Re-runs in the same ticket return the previous result instead of popping a new card/email
+        key = (interaction.channel.id, 'wool_order')
+        async with order_lock(key):
+            cached = None if force else get_cached_order(key)
+            if cached is not None:
+                return await interaction.response.send_message(
+                    f"{cached}\n♻️ Cached result for this ticket. Use `force:True` to pull a new card.", ephemeral=True)
+
+            embed = await fetch_order_embed(interaction.channel)
+            if embed is None:
+                return await interaction.response.send_message(
+                    "❌ Could not find order embed.", ephemeral=True)
+
+            info = parse_fields(embed)
+            # get card
+            card = get_and_remove_card()
+            if card is None:
+                return await interaction.response.send_message(
+                    "❌ Card pool is empty.", ephemeral=True)
+            number, cvv = card
+            # get email
+            email = get_and_remove_email()
+            if email is None:
+                return await interaction.response.send_message(
+                    "❌ Email pool is empty.", ephemeral=True)
+
+            # Format: link,number,MM/YY,cvv,zip,email
+            parts = [f"{info['link']},{number},{EXP_MONTH}/{EXP_YEAR},{cvv},{ZIP_CODE},{email}"]
+            command = parts[0]
+            tip_line = f"Tip: ${info['tip']}"
+
+            # LOG THE COMMAND OUTPUT
+            log_command_output(
+                command_type="wool_order",
+                user_id=interaction.user.id,
+                username=str(interaction.user),
+                channel_id=interaction.channel.id,
+                guild_id=interaction.guild.id if interaction.guild else None,
+                command_output=command,
+                tip_amount=info['tip'],
+                card_used=card,
+                email_used=email,
+                additional_data={"parsed_fields": info}
+            )
+
+            response = f"```{command}```\n{tip_line}"
+            cache_order(key, response)
+            await interaction.response.send_message(response, ephemeral=True)
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Orders(bot))
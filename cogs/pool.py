@@ -0,0 +1,382 @@
+import asyncio
+import io
+import sqlite3
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from checks import owner_only
+from db import bulk_remove, next_top_priority, DB_PATH
+from validation import parse_card_line, parse_email_line
+
+# Removal lists can be much longer than add lists, so allow larger uploads
+BULK_REMOVE_MAX_BYTES = 8 * 1024 * 1024  # 8MB
+
+# Entries listed inline in the reply before switching to a file attachment
+BULK_REMOVE_INLINE_LIMIT = 20
+
+
+class Pool(commands.Cog):
+    """Admin commands for managing the card and email pools."""
+
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+
+    @app_commands.command(name='add_card', description='(Admin) Add a card to the pool')
+    @app_commands.describe(
+        top="Add this card to the top of the pool so it's used first",
+        priority="Priority lane (higher is used first, default: 0)"
+    )
+    async def add_card(self, interaction: discord.Interaction, number: str, cvv: str, top: bool = False, priority: int = 0):
+        if not owner_only(interaction):
+            return await interaction.response.send_message("❌ Unauthorized.", ephemeral=True)
+        conn = sqlite3.connect(DB_PATH)
+        cur = conn.cursor()
+        if top:
+            priority = max(priority, next_top_priority(cur, 'cards'))
+        cur.execute("INSERT INTO cards (number, cvv, priority) VALUES (?, ?, ?)", (number, cvv, priority))
+        conn.commit()
+        conn.close()
+        await interaction.response.send_message(f"✅ Card ending in {number[-4:]} added (priority {priority}).", ephemeral=True)
+
+    @app_commands.command(name='add_email', description='(Admin) Add an email to the pool')
+    @app_commands.describe(
+        top="Add this email to the top of the pool so it's used first",
+        priority="Priority lane (higher is used first, default: 0)"
+    )
+    async def add_email(self, interaction: discord.Interaction, email: str, top: bool = False, priority: int = 0):
+        if not owner_only(interaction):
+            return await interaction.response.send_message("❌ Unauthorized.", ephemeral=True)
+        conn = sqlite3.connect(DB_PATH)
+        cur = conn.cursor()
+        if top:
+            priority = max(priority, next_top_priority(cur, 'emails'))
+        cur.execute("INSERT INTO emails (email, priority) VALUES (?, ?)", (email, priority))
+        conn.commit()
+        conn.close()
+        await interaction.response.send_message(f"✅ Email `{email}` added (priority {priority}).", ephemeral=True)
+
+    @app_commands.command(name='bulk_cards', description='(Admin) Add multiple cards from a text file')
+    @app_commands.describe(priority="Priority lane for every card in the file (higher is used first, default: 0)")
+    async def bulk_cards(self, interaction: discord.Interaction, file: discord.Attachment, priority: int = 0):
+        if not owner_only(interaction):
+            return await interaction.response.send_message("❌ Unauthorized.", ephemeral=True)
+
+        # Check if the file is a text file
+        if not file.filename.endswith('.txt'):
+            return await interaction.response.send_message("❌ Please upload a .txt file.", ephemeral=True)
+
+        # Check file size (limit to 1MB for safety)
+        if file.size > 1024 * 1024:  # 1MB
+            return await interaction.response.send_message("❌ File too large. Maximum size is 1MB.", ephemeral=True)
+
+        try:
+            # Download and read the file content
+            file_content = await file.read()
+            text_content = file_content.decode('utf-8')
+
+            # Parse the lines
+            lines = text_content.strip().split('\n')
+            cards_to_add = []
+            invalid_lines = []
+
+            for i, line in enumerate(lines, 1):
+                line = line.strip()
+                if not line:  # Skip empty lines
+                    continue
+
+                card, reason = parse_card_line(line)
+                if card is None:
+                    invalid_lines.append(f"Line {i}: '{line}' ({reason})")
+                    continue
+
+                cards_to_add.append(card)
+
+            # If there are invalid lines, show them
+            if invalid_lines:
+                error_msg = "❌ Found invalid lines:\n" + "\n".join(invalid_lines[:10])  # Limit to first 10 errors
+                if len(invalid_lines) > 10:
+                    error_msg += f"\n... and {len(invalid_lines) - 10} more errors"
+                return await interaction.response.send_message(error_msg, ephemeral=True)
+
+            # If no valid cards found
+            if not cards_to_add:
+                return await interaction.response.send_message("❌ No valid cards found in the file.", ephemeral=True)
+
+            # Add cards to database
+            conn = sqlite3.connect(DB_PATH)
+            cur = conn.cursor()
+
+            added_count = 0
+            duplicate_count = 0
+
+            for number, cvv in cards_to_add:
+                # Check if card already exists
+                cur.execute("SELECT COUNT(*) FROM cards WHERE number = ? AND cvv = ?", (number, cvv))
+                exists = cur.fetchone()[0] > 0
+
+                if exists:
+                    duplicate_count += 1
+                else:
+                    cur.execute("INSERT INTO cards (number, cvv, priority) VALUES (?, ?, ?)", (number, cvv, priority))
+                    added_count += 1
+
+            conn.commit()
+            conn.close()
+
+            success_msg = f"✅ Successfully added {added_count} cards to the pool."
+            if duplicate_count > 0:
+                success_msg += f" ({duplicate_count} duplicates skipped)"
+
+            await interaction.response.send_message(success_msg, ephemeral=True)
+
+        except UnicodeDecodeError:
+            await interaction.response.send_message("❌ Could not read file. Please ensure it's a valid UTF-8 text file.", ephemeral=True)
+        except Exception as e:
+            await interaction.response.send_message(f"❌ Error processing file: {str(e)}", ephemeral=True)
+
+    @app_commands.command(name='read_cards', description='(Admin) List all cards in the pool')
+    async def read_cards(self, interaction: discord.Interaction):
+        if not owner_only(interaction):
+            return await interaction.response.send_message("❌ Unauthorized.", ephemeral=True)
+
+        conn = sqlite3.connect(DB_PATH)
+        cur = conn.cursor()
+        cur.execute("SELECT number, cvv FROM cards ORDER BY priority DESC, id")
+        rows = cur.fetchall()
+        conn.close()
+
+        if not rows:
+            return await interaction.response.send_message("✅ No cards in the pool.", ephemeral=True)
+
+        # format as cardnum,cvv per line, in the order they will be used
+        lines = [f"{num},{cvv}" for num, cvv in rows]
+        payload = "Cards in pool:\n" + "\n".join(lines)
+        await interaction.response.send_message(f"```{payload}```", ephemeral=True)
+
+    @app_commands.command(name='read_emails', description='(Admin) List all emails in the pool')
+    async def read_emails(self, interaction: discord.Interaction):
+        if not owner_only(interaction):
+            return await interaction.response.send_message("❌ Unauthorized.", ephemeral=True)
+
+        conn = sqlite3.connect(DB_PATH)
+        cur = conn.cursor()
+        cur.execute("SELECT email FROM emails ORDER BY priority DESC, id")
+        rows = cur.fetchall()
+        conn.close()
+
+        if not rows:
+            return await interaction.response.send_message("✅ No emails in the pool.", ephemeral=True)
+
+        lines = [email for (email,) in rows]
+        payload = "Emails in pool:\n" + "\n".join(lines)
+        await interaction.response.send_message(f"```{payload}```", ephemeral=True)
+
+    @app_commands.command(name='remove_card', description='(Admin) Remove a card from the pool')
+    async def remove_card(self, interaction: discord.Interaction, number: str, cvv: str):
+        if not owner_only(interaction):
+            return await interaction.response.send_message("❌ Unauthorized.", ephemeral=True)
+
+        conn = sqlite3.connect(DB_PATH)
+        cur = conn.cursor()
+        cur.execute("DELETE FROM cards WHERE number = ? AND cvv = ?", (number, cvv))
+        deleted = cur.rowcount
+        conn.commit()
+        conn.close()
+
+        if deleted:
+            await interaction.response.send_message(
+                f"✅ Removed card ending in {number[-4:]}.", ephemeral=True
+            )
+        else:
+            await interaction.response.send_message(
+                "❌ No matching card found in the pool.", ephemeral=True
+            )
+
+    @app_commands.command(name='remove_email', description='(Admin) Remove an email from the pool')
+    async def remove_email(self, interaction: discord.Interaction, email: str):
+        if not owner_only(interaction):
+            return await interaction.response.send_message("❌ Unauthorized.", ephemeral=True)
+
+        conn = sqlite3.connect(DB_PATH)
+        cur = conn.cursor()
+        cur.execute("DELETE FROM emails WHERE email = ?", (email,))
+        deleted = cur.rowcount
+        conn.commit()
+        conn.close()
+
+        if deleted:
+            await interaction.response.send_message(
+                f"✅ Removed email `{email}` from the pool.", ephemeral=True
+            )
+        else:
+            await interaction.response.send_message(
+                "❌ No matching email found in the pool.", ephemeral=True
+            )
+
+    @app_commands.command(name='bulk_emails', description='(Admin) Add multiple emails from a text file')
+    @app_commands.describe(priority="Priority lane for every email in the file (higher is used first, default: 0)")
+    async def bulk_emails(self, interaction: discord.Interaction, file: discord.Attachment, priority: int = 0):
+        if not owner_only(interaction):
+            return await interaction.response.send_message("❌ Unauthorized.", ephemeral=True)
+
+        # Check if the file is a text file
+        if not file.filename.endswith('.txt'):
+            return await interaction.response.send_message("❌ Please upload a .txt file.", ephemeral=True)
+
+        # Check file size (limit to 1MB for safety)
+        if file.size > 1024 * 1024:  # 1MB
+            return await interaction.response.send_message("❌ File too large. Maximum size is 1MB.", ephemeral=True)
+
+        try:
+            # Download and read the file content
+            file_content = await file.read()
+            text_content = file_content.decode('utf-8')
+
+            # Parse the lines
+            lines = text_content.strip().split('\n')
+            emails_to_add = []
+            invalid_lines = []
+
+            for i, line in enumerate(lines, 1):
+                line = line.strip()
+                if not line:  # Skip empty lines
+                    continue
+
+                email, reason = parse_email_line(line)
+                if email is None:
+                    invalid_lines.append(f"Line {i}: '{line}' ({reason})")
+                    continue
+
+                emails_to_add.append(email)
+
+            # If there are invalid lines, show them
+            if invalid_lines:
+                error_msg = "❌ Found invalid lines:\n" + "\n".join(invalid_lines[:10])  # Limit to first 10 errors
+                if len(invalid_lines) > 10:
+                    error_msg += f"\n... and {len(invalid_lines) - 10} more errors"
+                return await interaction.response.send_message(error_msg, ephemeral=True)
+
+            # If no valid emails found
+            if not emails_to_add:
+                return await interaction.response.send_message("❌ No valid emails found in the file.", ephemeral=True)
+
+            # Add emails to database
+            conn = sqlite3.connect(DB_PATH)
+            cur = conn.cursor()
+
+            added_count = 0
+            duplicate_count = 0
+
+            for email in emails_to_add:
+                # Check if email already exists
+                cur.execute("SELECT COUNT(*) FROM emails WHERE email = ?", (email,))
+                exists = cur.fetchone()[0] > 0
+
+                if exists:
+                    duplicate_count += 1
+                else:
+                    cur.execute("INSERT INTO emails (email, priority) VALUES (?, ?)", (email, priority))
+                    added_count += 1
+
+            conn.commit()
+            conn.close()
+
+            success_msg = f"✅ Successfully added {added_count} emails to the pool."
+            if duplicate_count > 0:
+                success_msg += f" ({duplicate_count} duplicates skipped)"
+
+            await interaction.response.send_message(success_msg, ephemeral=True)
+
+        except UnicodeDecodeError:
+            await interaction.response.send_message("❌ Could not read file. Please ensure it's a valid UTF-8 text file.", ephemeral=True)
+        except Exception as e:
+            await interaction.response.send_message(f"❌ Error processing file: {str(e)}", ephemeral=True)
+
+    async def _bulk_remove(self, interaction: discord.Interaction, file: discord.Attachment, table: str):
+        """Remove every entry listed in an uploaded file from the cards or emails pool"""
+        if not owner_only(interaction):
+            return await interaction.response.send_message("❌ Unauthorized.", ephemeral=True)
+
+        # Check if the file is a text file
+        if not file.filename.endswith('.txt'):
+            return await interaction.response.send_message("❌ Please upload a .txt file.", ephemeral=True)
+
+        if file.size > BULK_REMOVE_MAX_BYTES:
+            return await interaction.response.send_message(
+                f"❌ File too large. Maximum size is {BULK_REMOVE_MAX_BYTES // (1024 * 1024)}MB.", ephemeral=True
+            )
+
+        try:
+            text_content = (await file.read()).decode('utf-8')
+        except UnicodeDecodeError:
+            return await interaction.response.send_message("❌ Could not read file. Please ensure it's a valid UTF-8 text file.", ephemeral=True)
+
+        # Same formats and validation as /bulk_cards and /bulk_emails
+        parse = parse_card_line if table == 'cards' else parse_email_line
+        entries = []
+        invalid_lines = []
+        for i, line in enumerate(text_content.splitlines(), 1):
+            line = line.strip()
+            if not line:  # Skip empty lines
+                continue
+            value, reason = parse(line)
+            if value is None:
+                invalid_lines.append(f"Line {i}: '{line}' ({reason})")
+                continue
+            entries.append(value if table == 'cards' else (value,))
+
+        if invalid_lines:
+            error_msg = "❌ Found invalid lines:\n" + "\n".join(invalid_lines[:10])  # Limit to first 10 errors
+            if len(invalid_lines) > 10:
+                error_msg += f"\n... and {len(invalid_lines) - 10} more errors"
+            return await interaction.response.send_message(error_msg, ephemeral=True)
+
+        if not entries:
+            return await interaction.response.send_message(f"❌ No valid {table} found in the file.", ephemeral=True)
+
+        await interaction.response.defer(ephemeral=True)
+        try:
+            # One temp-table join in a single transaction, off the event loop
+            removed, not_found, rows_deleted = await asyncio.to_thread(bulk_remove, table, entries)
+        except Exception as e:
+            return await interaction.followup.send(f"❌ Error removing {table}: {str(e)}", ephemeral=True)
+
+        summary = f"✅ Removed {len(removed)} {table} from the pool."
+        if rows_deleted != len(removed):
+            summary += f" ({rows_deleted} rows including duplicates)"
+        if not_found:
+            summary += f"\n❌ {len(not_found)} not found in the pool."
+
+        removed_lines = [",".join(entry) for entry in removed]
+        not_found_lines = [",".join(entry) for entry in not_found]
+        if len(removed_lines) + len(not_found_lines) <= BULK_REMOVE_INLINE_LIMIT:
+            details = ""
+            if removed_lines:
+                details += "\nRemoved:\n" + "\n".join(removed_lines)
+            if not_found_lines:
+                details += "\nNot found:\n" + "\n".join(not_found_lines)
+            if details:
+                summary += f"\n```{details.strip()}```"
+            return await interaction.followup.send(summary, ephemeral=True)
+
+        report = (
+            f"Removed ({len(removed_lines)}):\n" + "\n".join(removed_lines) +
+            f"\n\nNot found ({len(not_found_lines)}):\n" + "\n".join(not_found_lines) + "\n"
+        )
+        buffer = io.BytesIO(report.encode('utf-8'))
+        discord_file = discord.File(buffer, filename=f"removed_{table}.txt")
+        await interaction.followup.send(summary, file=discord_file, ephemeral=True)
+
+    @app_commands.command(name='bulk_remove_cards', description='(Admin) Remove multiple cards listed in a text file')
+    async def bulk_remove_cards(self, interaction: discord.Interaction, file: discord.Attachment):
+        await self._bulk_remove(interaction, file, 'cards')
+
+    @app_commands.command(name='bulk_remove_emails', description='(Admin) Remove multiple emails listed in a text file')
+    async def bulk_remove_emails(self, interaction: discord.Interaction, file: discord.Attachment):
+        await self._bulk_remove(interaction, file, 'emails')
+
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(Pool(bot))
@@ -0,0 +1,47 @@
+import os
+import json
+import hashlib
+
+from discord import app_commands
+
+from db import DB_PATH
+
+# File storing the fingerprint of the last synced command tree
+COMMAND_TREE_FINGERPRINT_PATH = DB_PATH.parent / 'command_tree.sha256'
+
+# Helper: fingerprint the registered app command definitions
+def command_tree_fingerprint(tree: app_commands.CommandTree) -> str:
+    """Return a SHA-256 hex digest of the global app command payloads."""
+    payload = sorted(
+        (cmd.to_dict(tree) for cmd in tree.get_commands()),
+        key=lambda c: (c.get('type', 1), c['name'])
+    )
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+def read_stored_fingerprint() -> str:
+    """Return the fingerprint saved after the last successful sync, or None."""
+    try:
+        return COMMAND_TREE_FINGERPRINT_PATH.read_text(encoding='utf-8').strip() or None
+    except OSError:
+        return None
+
+def store_fingerprint(fingerprint: str):
+    """Persist the fingerprint of the command tree that was just synced."""
+    COMMAND_TREE_FINGERPRINT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = COMMAND_TREE_FINGERPRINT_PATH.with_suffix(f'.{os.getpid()}.tmp')
+    tmp_path.write_text(fingerprint, encoding='utf-8')
+    os.replace(tmp_path, COMMAND_TREE_FINGERPRINT_PATH)
+
+async def sync_command_tree(tree: app_commands.CommandTree, force: bool = False):
+    """
+    Sync the global command tree only when its definitions changed.
+    Returns:
+        list: synced commands, or None if the sync was skipped.
+    """
+    fingerprint = command_tree_fingerprint(tree)
+    if not force and fingerprint == read_stored_fingerprint():
+        return None
+    synced = await tree.sync()
+    store_fingerprint(fingerprint)
+    return synced
@@ -1,32 +1,100 @@
+import os
 import sqlite3
+import time
+from datetime import datetime
 from pathlib import Path
 
 # Path to the SQLite database file
 DB_PATH = Path(__file__).parent / 'data' / 'pool.db'
 
+# Pages released per incremental vacuum step
+VACUUM_STEP_PAGES = 2000
+
+# Online backups: rotating snapshots copied a few pages at a time so pops can interleave
+BACKUP_DIR = DB_PATH.parent / 'backups'
+BACKUP_KEEP = int(os.getenv('DB_BACKUP_KEEP', '7'))
+BACKUP_STEP_PAGES = 64
+BACKUP_STEP_SLEEP = 0.002  # seconds between steps
+
+# Touched on every pop; its mtime schedules maintenance during idle periods and is
+# shared by every bot process using the pool
+LAST_POP_PATH = DB_PATH.parent / 'last_pop'
+
+
+def quarantine_db(reason: str) -> Path:
+    """
+    Move a damaged pool.db (and its WAL/SHM files) aside instead of deleting it,
+    so the inventory can still be recovered by hand.
+    Returns:
+        Path: where the database file was moved.
+    """
+    # Microseconds keep two quarantines in the same second from overwriting each other
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+    target = DB_PATH.with_name(f'{DB_PATH.name}.corrupt-{stamp}')
+    for suffix in ('', '-wal', '-shm'):
+        src = DB_PATH.with_name(DB_PATH.name + suffix)
+        if src.exists():
+            src.replace(target.with_name(target.name + suffix))
+    print(f"⚠️ Quarantined {DB_PATH.name} to {target.name}: {reason}")
+    return target
+
+
+def quick_check(conn) -> list:
+    """
+    Run PRAGMA quick_check.
+    Returns:
+        list: problems reported by SQLite, empty if the database is healthy.
+    """
+    rows = [row[0] for row in conn.execute('PRAGMA quick_check')]
+    return [] if rows == ['ok'] else rows
+
+
+def _is_corruption_error(e: sqlite3.DatabaseError) -> bool:
+    """
+    Return True only for errors meaning the file itself is damaged or not a database.
+    Errors such as "database is locked" come from a healthy file and must never
+    lead to quarantine.
+    """
+    code = getattr(e, 'sqlite_errorcode', None)  # Python 3.11+
+    if code is not None:
+        return code & 0xff in (sqlite3.SQLITE_CORRUPT, sqlite3.SQLITE_NOTADB)
+    # Older Pythons: locked, busy and I/O errors are OperationalError,
+    # while corruption and "file is not a database" are plain DatabaseError
+    return not isinstance(e, sqlite3.OperationalError)
+
 
 def init_db():
     """
     Initialize the SQLite database and ensure the tables exist.
-    If an existing pool.db file is corrupted or not a valid SQLite database, it will be removed and recreated.
+    If an existing pool.db file is corrupted or not a valid SQLite database, it is
+    quarantined (renamed to pool.db.corrupt-<timestamp>) and a fresh one is created.
+    Other errors, such as the database being locked by another process, are raised
+    and the file is left untouched.
     """
     # Create data directory if it doesn't exist
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
-    # If the database file exists but isn't a valid SQLite DB, delete it
+    # If the database file exists but isn't a healthy SQLite DB, move it aside
     if DB_PATH.exists():
         try:
             with DB_PATH.open('rb') as f:
                 header = f.read(16)
             # SQLite files start with "SQLite format 3\0"
             if not header.startswith(b"SQLite format 3\x00"):
-                DB_PATH.unlink()
-        except Exception:
-            # On any error, remove the file so it can be recreated
-            try:
-                DB_PATH.unlink()
-            except Exception:
-                pass
+                quarantine_db("invalid SQLite header")
+            else:
+                conn = sqlite3.connect(DB_PATH)
+                try:
+                    problems = quick_check(conn)
+                finally:
+                    conn.close()
+                if problems:
+                    quarantine_db("; ".join(problems[:5]))
+        except sqlite3.DatabaseError as e:
+            if not _is_corruption_error(e):
+                # e.g. another process holds a lock; the file is fine, so fail loudly instead
+                raise
+            quarantine_db(str(e))
 
     # Connect and create tables
     conn = sqlite3.connect(DB_PATH)
@@ -49,51 +117,290 @@ def init_db():
         )
     ''')
 
+    # Priority lanes: higher priority is used first, then oldest id within a lane
+    for table in ('cards', 'emails'):
+        cursor.execute(f'PRAGMA table_info({table})')
+        columns = {row[1] for row in cursor.fetchall()}
+        if 'priority' not in columns:
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN priority INTEGER NOT NULL DEFAULT 0')
+        cursor.execute(
+            f'CREATE INDEX IF NOT EXISTS idx_{table}_priority_id ON {table} (priority DESC, id)'
+        )
+
+    # Lookup indexes for duplicate checks and removals
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_cards_number_cvv ON cards (number, cvv)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_emails_email ON emails (email)')
+
     conn.commit()
+
+    # Incremental auto-vacuum lets maintenance return free pages in small steps.
+    # Switching an existing database needs one full VACUUM.
+    if cursor.execute('PRAGMA auto_vacuum').fetchone()[0] != 2:
+        cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        cursor.execute('VACUUM')
+
+    # WAL keeps readers and maintenance from blocking pops; the mode is persistent
+    cursor.execute('PRAGMA journal_mode = WAL')
     conn.close()
 
 
+def seconds_since_last_pop() -> float:
+    """Return seconds since any bot process last popped a card or email, or None if never."""
+    try:
+        return time.time() - LAST_POP_PATH.stat().st_mtime
+    except FileNotFoundError:
+        return None
+
+
+def run_maintenance(vacuum_pages: int = VACUUM_STEP_PAGES) -> dict:
+    """
+    Checkpoint the WAL, refresh planner statistics, release free pages and check integrity.
+    Returns:
+        dict: per-step timings in milliseconds, pages freed, and quick_check problems.
+    """
+    report = {}
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        start = time.perf_counter()
+        busy = conn.execute('PRAGMA wal_checkpoint(TRUNCATE)').fetchone()[0]
+        report['checkpoint_ms'] = (time.perf_counter() - start) * 1000
+        report['checkpoint_busy'] = bool(busy)
+
+        start = time.perf_counter()
+        conn.execute('ANALYZE')
+        conn.commit()
+        report['analyze_ms'] = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        free_before = conn.execute('PRAGMA freelist_count').fetchone()[0]
+        # Each result row is one freed page, so the statement must be stepped to completion
+        conn.execute(f'PRAGMA incremental_vacuum({int(vacuum_pages)})').fetchall()
+        conn.commit()
+        free_after = conn.execute('PRAGMA freelist_count').fetchone()[0]
+        report['vacuum_ms'] = (time.perf_counter() - start) * 1000
+        report['pages_freed'] = free_before - free_after
+        report['free_pages'] = free_after
+
+        start = time.perf_counter()
+        report['problems'] = quick_check(conn)
+        report['quick_check_ms'] = (time.perf_counter() - start) * 1000
+    finally:
+        conn.close()
+    return report
+
+
+def backup_db(keep: int = None) -> dict:
+    """
+    Snapshot the pool with SQLite's online backup API and keep the newest `keep` snapshots.
+    Each step copies BACKUP_STEP_PAGES pages and holds the read lock only for that step.
+    Returns:
+        dict: snapshot path, size in bytes, duration in milliseconds and pruned snapshots.
+    """
+    if keep is None:
+        keep = BACKUP_KEEP
+    BACKUP_DIR.mkdir(parents=True, exist_ok=True)
+    # Microsecond names, with a counter and an exclusive reservation of the partial
+    # file, so two backups started at the same moment never overwrite each other
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+    attempt = 0
+    while True:
+        suffix = f'_{attempt}' if attempt else ''
+        target = BACKUP_DIR / f'pool-{stamp}{suffix}.db'
+        partial = target.with_name(target.name + '.partial')
+        if not target.exists():
+            try:
+                partial.open('xb').close()
+                break
+            except FileExistsError:
+                pass
+        attempt += 1
+
+    start = time.perf_counter()
+    src = sqlite3.connect(DB_PATH)
+    dst = sqlite3.connect(partial)
+    try:
+        src.backup(dst, pages=BACKUP_STEP_PAGES, sleep=BACKUP_STEP_SLEEP)
+        # The copy inherits WAL mode; a rollback journal snapshot is a single self-contained file
+        dst.execute('PRAGMA journal_mode = DELETE')
+    finally:
+        dst.close()
+        src.close()
+    os.replace(partial, target)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    # Timestamped names sort oldest first
+    snapshots = sorted(BACKUP_DIR.glob('pool-*.db'))
+    pruned = []
+    for old in snapshots[:-keep] if keep > 0 else []:
+        old.unlink()
+        pruned.append(old.name)
+    # WAL side files of pruned snapshots (older snapshots were taken in WAL mode)
+    for side in BACKUP_DIR.glob('pool-*.db-*'):
+        if not side.with_name(side.name.rsplit('-', 1)[0]).exists():
+            side.unlink()
+
+    return {
+        'path': target,
+        'size': target.stat().st_size,
+        'backup_ms': elapsed_ms,
+        'pruned': pruned,
+    }
+
+
+def seconds_since_last_backup() -> float:
+    """Return the age of the newest snapshot in seconds, or None if there is none."""
+    snapshots = sorted(BACKUP_DIR.glob('pool-*.db'))
+    if not snapshots:
+        return None
+    return time.time() - snapshots[-1].stat().st_mtime
+
+
+def verify_backup(path: Path) -> dict:
+    """
+    Check a snapshot with PRAGMA quick_check and count its rows.
+    Returns:
+        dict: quick_check problems and card/email counts.
+    """
+    # Snapshots never change, so open them immutable: no locks and no -wal/-shm files
+    conn = sqlite3.connect(f'file:{path}?mode=ro&immutable=1', uri=True)
+    try:
+        problems = quick_check(conn)
+        cards = conn.execute('SELECT COUNT(*) FROM cards').fetchone()[0]
+        emails = conn.execute('SELECT COUNT(*) FROM emails').fetchone()[0]
+    finally:
+        conn.close()
+    return {'problems': problems, 'cards': cards, 'emails': emails}
+
+
+# Key columns used to match rows for bulk removal; each has a lookup index
+_REMOVAL_KEYS = {
+    'cards': ('number', 'cvv'),
+    'emails': ('email',),
+}
+
+
+def bulk_remove(table: str, entries) -> tuple:
+    """
+    Remove many entries from a pool in one transaction.
+    Entries are streamed into a temp table and deleted with a single join
+    against the pool's lookup index.
+    Args:
+        table: 'cards' or 'emails'
+        entries: iterable of key tuples, (number, cvv) for cards or (email,) for emails
+    Returns:
+        tuple: (removed, not_found, rows_deleted) where removed and not_found are
+        lists of the distinct key tuples in input order.
+    """
+    keys = _REMOVAL_KEYS[table]
+    columns = ', '.join(keys)
+    join_on = ' AND '.join(f'p.{key} = r.{key}' for key in keys)
+
+    conn = sqlite3.connect(DB_PATH, isolation_level=None)
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f'CREATE TEMP TABLE to_remove (seq INTEGER PRIMARY KEY, {columns})')
+        cursor.execute('BEGIN IMMEDIATE')
+        cursor.executemany(
+            f'INSERT INTO to_remove ({columns}) VALUES ({", ".join("?" for _ in keys)})',
+            entries
+        )
+
+        # Distinct input entries in first-seen order, flagged by whether the pool has them
+        cursor.execute(f'''
+            SELECT {', '.join(f'r.{key}' for key in keys)},
+                   EXISTS (SELECT 1 FROM {table} p WHERE {join_on}) AS found
+            FROM to_remove r
+            GROUP BY {', '.join(f'r.{key}' for key in keys)}
+            ORDER BY MIN(r.seq)
+        ''')
+        removed, not_found = [], []
+        for row in cursor.fetchall():
+            (removed if row[-1] else not_found).append(tuple(row[:-1]))
+
+        cursor.execute(f'''
+            DELETE FROM {table} WHERE id IN (
+                SELECT p.id FROM to_remove r JOIN {table} p ON {join_on}
+            )
+        ''')
+        rows_deleted = cursor.rowcount
+        cursor.execute('COMMIT')
+    except Exception:
+        if conn.in_transaction:
+            cursor.execute('ROLLBACK')
+        raise
+    finally:
+        conn.close()
+    return removed, not_found, rows_deleted
+
+
+def next_top_priority(cursor, table: str) -> int:
+    """
+    Return a priority that places a new row ahead of everything in the given pool.
+    Uses the (priority, id) index, so it is a single index seek.
+    """
+    cursor.execute(f'SELECT priority FROM {table} ORDER BY priority DESC, id LIMIT 1')
+    row = cursor.fetchone()
+    return row[0] + 1 if row else 0
+
+
+def _mark_pop():
+    try:
+        LAST_POP_PATH.touch()
+    except OSError as e:
+        print(f"Could not record pop time: {e}")
+
+
 def get_and_remove_card():
     """
-    Fetch the oldest card (by id) from the pool and remove it from the database.
+    Fetch the next card (highest priority, then oldest id) from the pool and remove it from the database.
     Returns:
         tuple: (card_number, cvv) if available, or None if no cards left.
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(DB_PATH, isolation_level=None)
     cursor = conn.cursor()
 
-    cursor.execute('SELECT id, number, cvv FROM cards ORDER BY id LIMIT 1')
+    # Take the write lock before reading, so concurrent pops from other shards,
+    # threads or processes can never receive the same row
+    cursor.execute('BEGIN IMMEDIATE')
+    cursor.execute('SELECT id, number, cvv FROM cards ORDER BY priority DESC, id LIMIT 1')
     row = cursor.fetchone()
     if not row:
+        cursor.execute('ROLLBACK')
         conn.close()
         return None
 
     card_id, number, cvv = row
     cursor.execute('DELETE FROM cards WHERE id = ?', (card_id,))
-    conn.commit()
+    cursor.execute('COMMIT')
     conn.close()
+    _mark_pop()
     return number, cvv
 
 
 def get_and_remove_email():
     """
-    Fetch the oldest email from the pool and remove it from the database.
+    Fetch the next email (highest priority, then oldest id) from the pool and remove it from the database.
     Returns:
         str: email address if available, or None if no emails left.
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(DB_PATH, isolation_level=None)
     cursor = conn.cursor()
 
-    cursor.execute('SELECT id, email FROM emails ORDER BY id LIMIT 1')
+    # Take the write lock before reading, so concurrent pops from other shards,
+    # threads or processes can never receive the same row
+    cursor.execute('BEGIN IMMEDIATE')
+    cursor.execute('SELECT id, email FROM emails ORDER BY priority DESC, id LIMIT 1')
     row = cursor.fetchone()
     if not row:
+        cursor.execute('ROLLBACK')
         conn.close()
         return None
 
     email_id, email = row
     cursor.execute('DELETE FROM emails WHERE id = ?', (email_id,))
-    conn.commit()
+    cursor.execute('COMMIT')
     conn.close()
+    _mark_pop()
     return email
 
 
@@ -0,0 +1,282 @@
+"""
+Compact columnar archives of command logs for offline reconciliation.
+
+An archive stores one column per field instead of one row per command:
+command types, emails and card digits are dictionary-encoded into integer
+codes, timestamps are packed 64-bit microsecond integers, and the command
+output and full card text are UTF-8 blobs with offset arrays. Every column is
+zlib-compressed on its own and loads straight back into an array.
+Text values are stored as one UTF-8 blob per column plus an array of
+end offsets, so any character (including NUL) round-trips.
+
+Usage:
+    python log_export.py 2024-05-01 2024-05-31 -o may.colog
+"""
+import argparse
+import json
+import os
+import struct
+import sys
+import zlib
+from array import array
+from datetime import datetime, timedelta
+from itertools import accumulate, chain, islice
+from typing import Dict, Any, Iterator
+
+from logging_utils import _month_log_entries, _months_between
+
+# File signature and format version
+ARCHIVE_MAGIC = b"COLOG\x00\x02\n"
+
+# Extension used for exported archives
+ARCHIVE_EXTENSION = ".colog"
+
+# zlib level per column; the columns are already compact, so favour speed
+COMPRESSION_LEVEL = 1
+
+# Entries encoded per batch while exporting
+EXPORT_BATCH_SIZE = 10_000
+
+EPOCH = datetime(1970, 1, 1)
+
+# Dictionary-encoded columns; code -1 means the value was missing
+DICT_COLUMNS = ("command_type", "email_used", "card_digits_9_16")
+
+# Variable-length text columns, each stored as a blob plus an end-offset array
+TEXT_COLUMNS = ("command_output", "card_full")
+
+# Suffix of the column holding a text column's end offsets
+OFFSETS_SUFFIX = ".offsets"
+
+# Largest text blob a uint32 offset can address
+MAX_TEXT_BYTES = 2 ** 32 - 1
+
+
+def _from_micros(micros: int) -> datetime:
+    """Convert packed microseconds back into a datetime"""
+    return EPOCH + timedelta(microseconds=micros)
+
+
+def _little_endian(values: array) -> bytes:
+    """Serialize an array in little-endian byte order"""
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _read_array(typecode: str, data: bytes) -> array:
+    """Load a little-endian column back into an array"""
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def iter_range_entries(start_date: str, end_date: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream log entries whose timestamp falls between two dates (inclusive)
+
+    Args:
+        start_date: First day in YYYY-MM-DD format
+        end_date: Last day in YYYY-MM-DD format
+
+    Yields:
+        Log entries from the monthly JSON logs, month by month
+    """
+    start = datetime.strptime(start_date, '%Y-%m-%d')
+    end = datetime.strptime(end_date, '%Y-%m-%d')
+    # Timestamps are ISO strings, so compare against the start of the following day
+    start_key = start.strftime('%Y-%m-%d')
+    end_key = (end + timedelta(days=1)).strftime('%Y-%m-%d')
+
+    for month in _months_between(start, end):
+        for entry in _month_log_entries(month):
+            if start_key <= entry["timestamp"] < end_key:
+                yield entry
+
+
+def write_archive(entries, path: str) -> int:
+    """
+    Write log entries to a columnar archive
+
+    Args:
+        entries: Iterable of log entry dictionaries
+        path: Destination file path
+
+    Returns:
+        Number of rows written
+    """
+    timestamps = array("q")
+    codes = {name: array("i") for name in DICT_COLUMNS}
+    dictionaries = {name: {} for name in DICT_COLUMNS}
+    texts = {name: [] for name in TEXT_COLUMNS}
+
+    # Encode column by column over bounded batches; per-column comprehensions
+    # are much cheaper than a per-row loop touching every column
+    epoch = EPOCH
+    one_micro = timedelta(microseconds=1)
+    parse = datetime.fromisoformat
+    entries = iter(entries)
+    while True:
+        batch = list(islice(entries, EXPORT_BATCH_SIZE))
+        if not batch:
+            break
+        timestamps.extend([(parse(entry["timestamp"]) - epoch) // one_micro for entry in batch])
+        for name in DICT_COLUMNS:
+            lookup = dictionaries[name]
+            setdefault = lookup.setdefault
+            values = [entry.get(name) for entry in batch]
+            codes[name].extend([-1 if value is None else setdefault(value, len(lookup)) for value in values])
+        for name in TEXT_COLUMNS:
+            texts[name].extend([entry.get(name) or "" for entry in batch])
+
+    # Raw column payloads in write order; each text column is a blob plus end offsets
+    payloads = [("timestamp", "q", _little_endian(timestamps))]
+    for name in DICT_COLUMNS:
+        payloads.append((name, "i", _little_endian(codes[name])))
+    for name in TEXT_COLUMNS:
+        encoded = [value.encode("utf-8") for value in texts[name]]
+        blob = b"".join(encoded)
+        if len(blob) > MAX_TEXT_BYTES:
+            raise ValueError(f"Column {name} is too large for one archive; export a shorter date range")
+        payloads.append((name, "B", blob))
+        payloads.append((name + OFFSETS_SUFFIX, "I", _little_endian(array("I", accumulate(map(len, encoded))))))
+
+    compressed = [(name, typecode, zlib.compress(raw, COMPRESSION_LEVEL)) for name, typecode, raw in payloads]
+    header = {
+        "rows": len(timestamps),
+        "columns": [[name, typecode, len(data)] for name, typecode, data in compressed],
+        "dictionaries": {name: list(dictionaries[name]) for name in DICT_COLUMNS},
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(ARCHIVE_MAGIC)
+        f.write(struct.pack("<I", len(header_bytes)))
+        f.write(header_bytes)
+        for _, _, data in compressed:
+            f.write(data)
+    os.replace(tmp_path, path)
+    return header["rows"]
+
+
+class ColumnarLog:
+    """
+    Array-backed view of an exported archive
+
+    Columns stay in their encoded form: `timestamps` is an array of
+    microseconds, dictionary columns are arrays of codes with their value
+    lists in `dictionaries`, and text columns are decoded only when first
+    accessed.
+    """
+
+    def __init__(self, rows: int, columns: Dict[str, array], dictionaries: Dict[str, list]):
+        self.rows = rows
+        self.timestamps = columns["timestamp"]
+        self.codes = {name: columns[name] for name in DICT_COLUMNS}
+        self.dictionaries = dictionaries
+        self._text_data = {name: columns[name].tobytes() for name in TEXT_COLUMNS}
+        self._text_offsets = {name: columns[name + OFFSETS_SUFFIX] for name in TEXT_COLUMNS}
+        self._texts = {}
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def value(self, name: str, index: int):
+        """Return the decoded value of a dictionary column for one row"""
+        code = self.codes[name][index]
+        return None if code < 0 else self.dictionaries[name][code]
+
+    def text_column(self, name: str) -> list:
+        """Return all values of a text column, decoding it on first access"""
+        values = self._texts.get(name)
+        if values is None:
+            values = self._texts[name] = self._decode_text(name) if self.rows else []
+        return values
+
+    def _decode_text(self, name: str) -> list:
+        data = self._text_data[name]
+        offsets = self._text_offsets[name]
+        text = data.decode("utf-8")
+        bounds = zip(chain((0,), offsets), offsets)
+        if len(text) == len(data):
+            # ASCII only: byte offsets are also character offsets
+            return [text[start:end] for start, end in bounds]
+        return [data[start:end].decode("utf-8") for start, end in bounds]
+
+    def text(self, name: str, index: int) -> str:
+        """Return the value of a text column for one row"""
+        return self.text_column(name)[index]
+
+    def counts(self, name: str) -> Dict[str, int]:
+        """Count rows per value of a dictionary column without decoding rows"""
+        tally = [0] * len(self.dictionaries[name])
+        for code in self.codes[name]:
+            if code >= 0:
+                tally[code] += 1
+        return {value: count for value, count in zip(self.dictionaries[name], tally)}
+
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        """Yield rows as log entry dictionaries"""
+        for i in range(self.rows):
+            row = {"timestamp": _from_micros(self.timestamps[i]).isoformat()}
+            for name in DICT_COLUMNS:
+                row[name] = self.value(name, i)
+            for name in TEXT_COLUMNS:
+                row[name] = self.text(name, i) or None
+            yield row
+
+
+def load_archive(path: str) -> ColumnarLog:
+    """
+    Load a columnar archive written by write_archive
+
+    Args:
+        path: Archive file path
+
+    Returns:
+        ColumnarLog with array-backed columns
+    """
+    with open(path, "rb") as f:
+        if f.read(len(ARCHIVE_MAGIC)) != ARCHIVE_MAGIC:
+            raise ValueError(f"{path} is not a command log archive")
+        (header_length,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(header_length).decode("utf-8"))
+        columns = {}
+        for name, typecode, length in header["columns"]:
+            columns[name] = _read_array(typecode, zlib.decompress(f.read(length)))
+    return ColumnarLog(header["rows"], columns, header["dictionaries"])
+
+
+def export_logs(start_date: str, end_date: str, path: str) -> int:
+    """
+    Export the logs between two dates (inclusive) to a columnar archive
+
+    Args:
+        start_date: First day in YYYY-MM-DD format
+        end_date: Last day in YYYY-MM-DD format
+        path: Destination file path
+
+    Returns:
+        Number of rows exported
+    """
+    return write_archive(iter_range_entries(start_date, end_date), path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export command logs to a compact columnar archive")
+    parser.add_argument("start", help="First day to export (YYYY-MM-DD)")
+    parser.add_argument("end", help="Last day to export (YYYY-MM-DD)")
+    parser.add_argument("-o", "--output", help="Archive path (default: logs_<start>_<end>.colog)")
+    args = parser.parse_args()
+
+    output = args.output or f"logs_{args.start}_{args.end}{ARCHIVE_EXTENSION}"
+    rows = export_logs(args.start, args.end, output)
+    print(f"Exported {rows} log entries to {output} ({os.path.getsize(output)} bytes)")
+
+
+if __name__ == '__main__':
+    main()
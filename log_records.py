@@ -0,0 +1,152 @@
+"""
+Typed command log records and the JSON encoder backend used to write them.
+
+A CommandLogRecord is built once per order and then serialized once per
+log format (JSON, CSV, TXT and the search index). The JSON encoder is
+pluggable: the fastest available backend is picked at import time
+(orjson if installed, else the standard library), and LOG_JSON_BACKEND
+can force a specific one.
+"""
+import json
+import os
+from datetime import datetime
+from typing import Dict, Any, Callable
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+# Columns of the monthly CSV logs, in order
+CSV_HEADERS = (
+    "timestamp", "command_type", "command_output",
+    "email_used", "card_full", "card_digits_9_12"
+)
+
+_TXT_RULE = "=" * 80
+
+
+def _stdlib_encode(obj: Any) -> bytes:
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _orjson_encode(obj: Any) -> bytes:
+    try:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    except orjson.JSONEncodeError:
+        # Values orjson rejects (e.g. integers over 64 bits) still encode with the stdlib
+        return _stdlib_encode(obj)
+
+
+# Encoders producing 2-space indented UTF-8 JSON, fastest first
+JSON_BACKENDS: Dict[str, Callable[[Any], bytes]] = {}
+if orjson is not None:
+    JSON_BACKENDS["orjson"] = _orjson_encode
+JSON_BACKENDS["json"] = _stdlib_encode
+
+JSON_BACKEND = os.getenv("LOG_JSON_BACKEND") or next(iter(JSON_BACKENDS))
+if JSON_BACKEND not in JSON_BACKENDS:
+    print(f"⚠️ LOG_JSON_BACKEND '{JSON_BACKEND}' is not available, using the standard library")
+    JSON_BACKEND = "json"
+encode_json = JSON_BACKENDS[JSON_BACKEND]
+
+
+def set_json_backend(name: str):
+    """Switch the JSON encoder used for log records ('orjson' or 'json')"""
+    global JSON_BACKEND, encode_json
+    if name not in JSON_BACKENDS:
+        raise ValueError(f"JSON backend '{name}' is not available (choose from {', '.join(JSON_BACKENDS)})")
+    JSON_BACKEND = name
+    encode_json = JSON_BACKENDS[name]
+
+
+def json_array_item(entry: Dict[str, Any]) -> bytes:
+    """Encode a log entry as an element of the indented JSON log array"""
+    return b"  " + encode_json(entry).replace(b"\n", b"\n  ")
+
+
+def search_row(entry: Dict[str, Any]) -> tuple:
+    """Build the full-text search index row for a log entry"""
+    return (
+        entry.get("command_output") or "",
+        entry.get("email_used") or "",
+        entry.get("card_digits_9_16") or "",
+        entry.get("command_type"),
+        entry.get("timestamp"),
+    )
+
+
+class CommandLogRecord:
+    """One logged command, with the card fields derived once at construction"""
+
+    __slots__ = (
+        "timestamp", "iso_timestamp", "command_type", "command_output", "email_used",
+        "card_full", "card_digits_9_12", "card_digits_9_16", "additional_data",
+    )
+
+    def __init__(
+        self,
+        command_type: str,
+        command_output: str,
+        card_used: tuple = None,
+        email_used: str = None,
+        additional_data: Dict[str, Any] = None,
+        timestamp: datetime = None,
+    ):
+        self.timestamp = timestamp or datetime.now()
+        self.iso_timestamp = self.timestamp.isoformat()
+        self.command_type = command_type
+        self.command_output = command_output
+        self.email_used = email_used
+        self.additional_data = additional_data or {}
+
+        # Extract digits 9-16 from card number (0-indexed, so positions 8-15)
+        self.card_full = self.card_digits_9_12 = self.card_digits_9_16 = None
+        if card_used:
+            card_number, card_cvv = card_used
+            self.card_full = f"{card_number} CVV:{card_cvv}"
+            if len(card_number) >= 12:
+                self.card_digits_9_12 = card_number[8:12]
+            if len(card_number) >= 16:
+                self.card_digits_9_16 = card_number[8:16]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the log entry as stored in the monthly JSON logs"""
+        return {
+            "timestamp": self.iso_timestamp,
+            "command_type": self.command_type,
+            "command_output": self.command_output,
+            "email_used": self.email_used,
+            "card_full": self.card_full,
+            "card_digits_9_12": self.card_digits_9_12,
+            "card_digits_9_16": self.card_digits_9_16,
+            "additional_data": self.additional_data,
+        }
+
+    def json_array_item(self) -> bytes:
+        """Encode the entry as an element of the indented JSON log array"""
+        return json_array_item(self.to_dict())
+
+    def csv_row(self) -> tuple:
+        return (
+            self.iso_timestamp, self.command_type, self.command_output,
+            self.email_used, self.card_full, self.card_digits_9_12,
+        )
+
+    def txt_block(self) -> str:
+        """Format the entry for the human-readable daily text log"""
+        lines = [
+            "",
+            _TXT_RULE,
+            f"TIMESTAMP: {self.timestamp.strftime('%Y-%m-%d %H:%M:%S')}",
+            f"COMMAND TYPE: {self.command_type}",
+        ]
+        if self.email_used:
+            lines.append(f"EMAIL USED: {self.email_used}")
+        if self.card_full:
+            lines.append(f"CARD USED: {self.card_full}")
+        if self.card_digits_9_12:
+            lines.append(f"CARD DIGITS 9-12: {self.card_digits_9_12}")
+        lines.append(f"\nCOMMAND OUTPUT:\n{self.command_output}")
+        lines.append(_TXT_RULE)
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,229 @@
+"""
+Command log statistics over arbitrary date ranges.
+
+Each monthly JSON log is reduced to per-day partial aggregates (command
+counts by type, distinct emails and card digits, first and last
+timestamp). Months that are not cached are processed in parallel in a
+process pool, and the partials of the days inside the requested range
+are merged. Partials of finished months never change, so they are
+cached under logs/stats_cache/ and reused until the log file is
+rewritten (e.g. compressed by rotation).
+"""
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from typing import Dict, Any
+
+from logging_utils import LOGS_DIR, _find_log_files, _is_finished_period, _month_log_entries, _months_between
+
+# Cached partials of finished months
+STATS_CACHE_DIR = os.path.join(LOGS_DIR, "stats_cache")
+
+# Worker processes used when several months need processing
+LOG_STATS_WORKERS = int(os.getenv('LOG_STATS_WORKERS', str(min(4, os.cpu_count() or 1))))
+
+# Created on first use and kept for later requests; spawned rather than forked,
+# because forking the bot process would copy its running threads' locks.
+# Spawned workers import the main script as __mp_main__, which is why bot.py
+# keeps all of its setup inside main().
+_executor = None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=LOG_STATS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executor
+
+
+def _map_months(months: list) -> list:
+    """Compute month partials in the process pool, restarting it once if it broke"""
+    global _executor
+    try:
+        return list(_get_executor().map(_month_partials, months))
+    except BrokenProcessPool:
+        # A worker died (e.g. killed for memory); a broken pool stays broken, so replace it
+        print("Log stats worker pool broke, restarting it")
+        broken, _executor = _executor, None
+        broken.shutdown(wait=False)
+        return list(_get_executor().map(_month_partials, months))
+
+
+def _month_partials(month: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Reduce one month's log to per-day partial aggregates (runs in a worker process)
+
+    Returns:
+        Mapping of YYYY-MM-DD to a partial with total, command_types,
+        emails, cards, start and end
+    """
+    days = {}
+    for entry in _month_log_entries(month):
+        timestamp = entry["timestamp"]
+        day = timestamp[:10]
+        partial = days.get(day)
+        if partial is None:
+            partial = days[day] = {
+                "total": 0,
+                "command_types": {},
+                "emails": set(),
+                "cards": set(),
+                "start": timestamp,
+                "end": timestamp,
+            }
+        partial["total"] += 1
+        cmd_type = entry["command_type"]
+        partial["command_types"][cmd_type] = partial["command_types"].get(cmd_type, 0) + 1
+        if entry.get("email_used"):
+            partial["emails"].add(entry["email_used"])
+        if entry.get("card_digits_9_12"):
+            partial["cards"].add(entry["card_digits_9_12"])
+        if timestamp < partial["start"]:
+            partial["start"] = timestamp
+        if timestamp > partial["end"]:
+            partial["end"] = timestamp
+
+    # Sorted lists so partials pickle and cache as plain JSON
+    for partial in days.values():
+        partial["emails"] = sorted(partial["emails"])
+        partial["cards"] = sorted(partial["cards"])
+    return days
+
+
+def _cache_path(month: str) -> str:
+    return os.path.join(STATS_CACHE_DIR, f"commands_{month}.json")
+
+
+def _load_cached(month: str, log_files: list):
+    """Return the cached partials of a month, or None if missing or older than the log"""
+    path = _cache_path(month)
+    try:
+        if os.path.getmtime(path) < max(map(os.path.getmtime, log_files)):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _store_cached(month: str, partials: Dict[str, Dict[str, Any]]):
+    """Write a month's partials to the cache, atomically"""
+    try:
+        os.makedirs(STATS_CACHE_DIR, exist_ok=True)
+        path = _cache_path(month)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(partials, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Error caching log stats for {month}: {e}")
+
+
+def get_range_stats(start_date: str, end_date: str) -> Dict[str, Any]:
+    """
+    Get statistics about logged commands between two dates (inclusive)
+
+    Blocks while months are processed, so call it from a worker thread
+    when running on the event loop.
+
+    Args:
+        start_date: First day in YYYY-MM-DD format
+        end_date: Last day in YYYY-MM-DD format
+
+    Returns:
+        Dictionary with total_commands, command_types, emails_used,
+        cards_used, unique_emails, unique_cards, date_range, a per-day
+        series in "daily", and how many months were read and came from
+        the cache
+    """
+    try:
+        start = datetime.strptime(start_date, '%Y-%m-%d')
+        end = datetime.strptime(end_date, '%Y-%m-%d')
+    except ValueError:
+        return {"error": "Invalid date. Use YYYY-MM-DD."}
+    if start > end:
+        return {"error": "Start date must not be after end date."}
+
+    now = datetime.now()
+    months = {}
+    for month in _months_between(start, end):
+        log_files = _find_log_files(os.path.join(LOGS_DIR, f"commands_{month}.json"))
+        if log_files:
+            months[month] = log_files
+    if not months:
+        return {"error": "No log files found for specified range"}
+
+    try:
+        partials = {}
+        pending = []
+        for month, log_files in months.items():
+            cached = _load_cached(month, log_files) if _is_finished_period(month, now) else None
+            if cached is None:
+                pending.append(month)
+            else:
+                partials[month] = cached
+
+        # A single month is not worth the process start-up cost
+        if len(pending) == 1:
+            computed = [_month_partials(pending[0])]
+        else:
+            computed = _map_months(pending)
+
+        for month, days in zip(pending, computed):
+            partials[month] = days
+            if _is_finished_period(month, now):
+                _store_cached(month, days)
+    except Exception as e:
+        return {"error": f"Error reading log files: {e}"}
+
+    # Merge the partials of the days inside the range
+    first_day = start.strftime('%Y-%m-%d')
+    last_day = end.strftime('%Y-%m-%d')
+    stats = {
+        "total_commands": 0,
+        "command_types": {},
+        "emails_used": set(),
+        "cards_used": set(),
+        "date_range": {"start": None, "end": None},
+        "daily": {},
+    }
+    for month in sorted(partials):
+        for day, partial in sorted(partials[month].items()):
+            if not first_day <= day <= last_day:
+                continue
+            stats["total_commands"] += partial["total"]
+            for cmd_type, count in partial["command_types"].items():
+                stats["command_types"][cmd_type] = stats["command_types"].get(cmd_type, 0) + count
+            stats["emails_used"].update(partial["emails"])
+            stats["cards_used"].update(partial["cards"])
+            stats["daily"][day] = partial["total"]
+            if stats["date_range"]["start"] is None or partial["start"] < stats["date_range"]["start"]:
+                stats["date_range"]["start"] = partial["start"]
+            if stats["date_range"]["end"] is None or partial["end"] > stats["date_range"]["end"]:
+                stats["date_range"]["end"] = partial["end"]
+
+    stats["unique_emails"] = len(stats["emails_used"])
+    stats["unique_cards"] = len(stats["cards_used"])
+    stats["emails_used"] = sorted(stats["emails_used"])
+    stats["cards_used"] = sorted(stats["cards_used"])
+    stats["months"] = len(months)
+    stats["cached_months"] = len(months) - len(pending)
+    return stats
+
+
+def month_range(month: str = None) -> tuple:
+    """
+    Return the first and last day of a YYYYMM month (default: current month)
+
+    Returns:
+        (start_date, end_date) in YYYY-MM-DD format
+    """
+    start = datetime.strptime(month, '%Y%m') if month else datetime.now().replace(day=1)
+    next_month = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start.strftime('%Y-%m-%d'), (next_month - timedelta(days=1)).strftime('%Y-%m-%d')
@@ -1,13 +1,66 @@
 import os
+import re
 import json
 import csv
-from datetime import datetime
-from typing import Dict, Any
+import gzip
+import heapq
+import itertools
+import shutil
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows has no flock; run one bot process per logs directory there
+    fcntl = None
+
+from log_records import CommandLogRecord, CSV_HEADERS, json_array_item, search_row
 
 # Create logs directory if it doesn't exist
 LOGS_DIR = "logs"
 os.makedirs(LOGS_DIR, exist_ok=True)
 
+# Suffix used for compressed archive segments of finished periods
+ARCHIVE_SUFFIX = ".gz"
+
+# Total bytes the logs directory may use before the oldest archives are pruned
+LOG_DISK_BUDGET = int(os.getenv('LOG_DISK_BUDGET_MB', '512')) * 1024 * 1024
+
+# SQLite FTS5 index over command history, kept current by log_command_output
+SEARCH_DB_PATH = os.path.join(LOGS_DIR, "search_index.db")
+
+# Seconds a logged command waits for the search index before skipping the entry
+SEARCH_INDEX_WRITE_TIMEOUT = 0.5
+
+# Serializes log writes; the bot may write from several shards and worker threads
+_write_lock = threading.Lock()
+
+# Lock file shared by every bot process that writes to LOGS_DIR
+WRITE_LOCK_PATH = os.path.join(LOGS_DIR, ".write.lock")
+
+# Characters read per chunk by the streaming JSON log reader
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Matches monthly (commands_YYYYMM.json/.csv) and daily (commands_YYYYMMDD.txt) logs
+_LOG_NAME_RE = re.compile(r"^commands_(\d{6}|\d{8})\.(json|csv|txt)(\.gz)?$")
+
+@contextmanager
+def _log_write_lock():
+    """Hold the log write lock across threads and, where flock is available, processes"""
+    with _write_lock:
+        if fcntl is None:
+            yield
+            return
+        with open(WRITE_LOCK_PATH, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
 def log_command_output(
     command_type: str,
     user_id: int,
@@ -35,224 +88,452 @@ def log_command_output(
         email_used: Email that was consumed
         additional_data: Any additional data to log
     """
-    timestamp = datetime.now()
-    
-    # Extract digits 9-16 from card number (0-indexed, so positions 8-15)
-    card_digits_9_12 = None
-    card_digits_9_16 = None
-    card_full = None
-    card_cvv = None
-    if card_used:
-        card_number = card_used[0]
-        card_cvv = card_used[1]
-        card_full = f"{card_number} CVV:{card_cvv}"
-        if len(card_number) >= 12:
-            card_digits_9_12 = card_number[8:12]  # Digits 9-12 (0-indexed)
-        if len(card_number) >= 16:
-            card_digits_9_16 = card_number[8:16]  # Digits 9-16 (0-indexed)
-    
-    # Prepare log entry
-    log_entry = {
-        "timestamp": timestamp.isoformat(),
-        "command_type": command_type,
-        "command_output": command_output,
-        "email_used": email_used,
-        "card_full": card_full,
-        "card_digits_9_12": card_digits_9_12,
-        "card_digits_9_16": card_digits_9_16,
-        "additional_data": additional_data or {}
-    }
+    # Build the record once; each format below serializes it exactly once
+    record = CommandLogRecord(command_type, command_output, card_used, email_used, additional_data)
+    month = record.timestamp.strftime('%Y%m')
     
-    # Log to JSON file (detailed structured data)
-    json_file = os.path.join(LOGS_DIR, f"commands_{timestamp.strftime('%Y%m')}.json")
-    _log_to_json(json_file, log_entry)
-    
-    # Log to CSV file (for easy analysis)
-    csv_file = os.path.join(LOGS_DIR, f"commands_{timestamp.strftime('%Y%m')}.csv")
-    _log_to_csv(csv_file, log_entry)
-    
-    # Log to daily text file (human readable)
-    txt_file = os.path.join(LOGS_DIR, f"commands_{timestamp.strftime('%Y%m%d')}.txt")
-    _log_to_txt(txt_file, log_entry, timestamp)
+    with _log_write_lock():
+        # Log to JSON file (detailed structured data)
+        json_file = os.path.join(LOGS_DIR, f"commands_{month}.json")
+        _log_to_json(json_file, record)
+        
+        # Log to CSV file (for easy analysis)
+        csv_file = os.path.join(LOGS_DIR, f"commands_{month}.csv")
+        _log_to_csv(csv_file, record)
+        
+        # Log to daily text file (human readable)
+        txt_file = os.path.join(LOGS_DIR, f"commands_{record.timestamp.strftime('%Y%m%d')}.txt")
+        _log_to_txt(txt_file, record)
+        
+        # Add to the full-text search index
+        _log_to_search_index(record)
 
-def _log_to_json(filename: str, log_entry: Dict[str, Any]):
+def _log_to_json(filename: str, record: CommandLogRecord):
     """Append log entry to JSON file"""
     try:
-        # Read existing data
-        if os.path.exists(filename):
-            with open(filename, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-        else:
-            data = []
+        item = record.json_array_item()
+        # Per-process temp name, so a writer can never swap in another process's file
+        tmp_filename = f"{filename}.{os.getpid()}.tmp"
+        if not os.path.exists(filename):
+            with open(tmp_filename, 'wb') as f:
+                f.write(b"[\n" + item + b"\n]")
+            os.replace(tmp_filename, filename)
+            return
         
-        # Append new entry
-        data.append(log_entry)
+        # Copy the existing array byte for byte and splice the new entry in before
+        # its closing bracket, instead of parsing and re-encoding every entry
+        shutil.copyfile(filename, tmp_filename)
+        with open(tmp_filename, 'r+b') as f:
+            size = f.seek(0, os.SEEK_END)
+            tail_start = max(0, size - 64)
+            f.seek(tail_start)
+            tail = f.read()
+            close = tail.rfind(b"]")
+            if close < 0:
+                raise ValueError(f"{filename} is not a JSON array")
+            body_end = tail_start + len(tail[:close].rstrip())
+            f.seek(body_end - 1)
+            empty = f.read(1) == b"["
+            f.seek(body_end)
+            f.truncate()
+            f.write((b"\n" if empty else b",\n") + item + b"\n]")
         
-        # Write back to file
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Swap the temp file in, so concurrent readers never see a partial file
+        os.replace(tmp_filename, filename)
     except Exception as e:
         print(f"Error logging to JSON: {e}")
 
-def _log_to_csv(filename: str, log_entry: Dict[str, Any]):
+def _log_to_csv(filename: str, record: CommandLogRecord):
     """Append log entry to CSV file"""
     try:
-        # Define CSV headers
-        headers = [
-            "timestamp", "command_type", "command_output", 
-            "email_used", "card_full", "card_digits_9_12"
-        ]
-        
         # Check if file exists
         file_exists = os.path.exists(filename)
         
-        # Prepare row data
-        row_data = [
-            log_entry["timestamp"],
-            log_entry["command_type"],
-            log_entry["command_output"],
-            log_entry["email_used"],
-            log_entry["card_full"],
-            log_entry["card_digits_9_12"]
-        ]
-        
         with open(filename, 'a', newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
             # Write header if file is new
             if not file_exists:
-                writer.writerow(headers)
-            writer.writerow(row_data)
+                writer.writerow(CSV_HEADERS)
+            writer.writerow(record.csv_row())
     except Exception as e:
         print(f"Error logging to CSV: {e}")
 
-def _log_to_txt(filename: str, log_entry: Dict[str, Any], timestamp: datetime):
+def _log_to_txt(filename: str, record: CommandLogRecord):
     """Append log entry to text file in human-readable format"""
     try:
         with open(filename, 'a', encoding='utf-8') as f:
-            f.write(f"\n{'='*80}\n")
-            f.write(f"TIMESTAMP: {timestamp.strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"COMMAND TYPE: {log_entry['command_type']}\n")
-            if log_entry['email_used']:
-                f.write(f"EMAIL USED: {log_entry['email_used']}\n")
-            if log_entry['card_full']:
-                f.write(f"CARD USED: {log_entry['card_full']}\n")
-            if log_entry['card_digits_9_12']:
-                f.write(f"CARD DIGITS 9-12: {log_entry['card_digits_9_12']}\n")
-            f.write(f"\nCOMMAND OUTPUT:\n{log_entry['command_output']}\n")
-            f.write(f"{'='*80}\n")
+            f.write(record.txt_block())
     except Exception as e:
         print(f"Error logging to TXT: {e}")
 
-def get_recent_logs(count: int = 10) -> list:
+def _connect_search_index(path: str = SEARCH_DB_PATH, timeout: float = 5.0) -> sqlite3.Connection:
+    """Open the search index database, creating the FTS table if needed"""
+    conn = sqlite3.connect(path, timeout=timeout)
+    columns = "command_output, email_used, card_digits_9_16, command_type UNINDEXED, timestamp UNINDEXED"
+    try:
+        # Trigram tokens allow substring matches such as a card suffix or email domain
+        conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS command_search USING fts5({columns}, tokenize='trigram')")
+    except sqlite3.OperationalError:
+        # SQLite older than 3.34 has no trigram tokenizer
+        conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS command_search USING fts5({columns})")
+    return conn
+
+def _log_to_search_index(record: CommandLogRecord):
+    """Add a log entry to the full-text search index"""
+    try:
+        # Runs under the log write lock, so never wait long; /rebuild_search_index recovers a skipped entry
+        conn = _connect_search_index(timeout=SEARCH_INDEX_WRITE_TIMEOUT)
+        with conn:
+            conn.execute("INSERT INTO command_search VALUES (?, ?, ?, ?, ?)", search_row(record.to_dict()))
+        conn.close()
+    except Exception as e:
+        print(f"Error logging to search index: {e}")
+
+def _fts_query(query: str) -> str:
+    """Quote each search term so emails and punctuation are matched literally"""
+    terms = query.split()
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+def search_logs(query: str, start_date: str = None, end_date: str = None, limit: int = 25) -> list:
     """
-    Get the most recent log entries
+    Search command history by command output, email, or card digits 9-16
     
     Args:
-        count: Number of recent logs to retrieve
+        query: Search terms; every term must match (substring match, 3+ characters)
+        start_date: Optional first day to include, in YYYY-MM-DD format
+        end_date: Optional last day to include, in YYYY-MM-DD format
+        limit: Maximum number of results
     
     Returns:
-        List of recent log entries
+        List of matching log entries, most recent first
     """
-    current_month = datetime.now().strftime('%Y%m')
-    json_file = os.path.join(LOGS_DIR, f"commands_{current_month}.json")
-    
-    if not os.path.exists(json_file):
+    fts_query = _fts_query(query)
+    if not fts_query:
         return []
     
+    sql = ("SELECT timestamp, command_type, command_output, email_used, card_digits_9_16 "
+           "FROM command_search WHERE command_search MATCH ?")
+    params = [fts_query]
+    if start_date:
+        sql += " AND timestamp >= ?"
+        params.append(start_date)
+    if end_date:
+        # Timestamps are ISO strings, so compare against the start of the following day
+        end = datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1)
+        sql += " AND timestamp < ?"
+        params.append(end.strftime('%Y-%m-%d'))
+    sql += " ORDER BY timestamp DESC LIMIT ?"
+    params.append(limit)
+    
     try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # Sort by timestamp (most recent first) and take the requested count
-        sorted_data = sorted(data, key=lambda x: x["timestamp"], reverse=True)
-        return sorted_data[:count]
+        conn = _connect_search_index()
+        rows = conn.execute(sql, params).fetchall()
+        conn.close()
     except Exception as e:
-        print(f"Error reading log file: {e}")
+        print(f"Error searching logs: {e}")
         return []
+    
+    keys = ("timestamp", "command_type", "command_output", "email_used", "card_digits_9_16")
+    return [dict(zip(keys, row)) for row in rows]
 
-def get_full_logs(count: int = 5) -> list:
+def _index_month(conn: sqlite3.Connection, month: str, skip: int) -> int:
+    """Add a month's JSON log entries after the first `skip` to a search index, returning how many"""
+    try:
+        cursor = conn.executemany(
+            "INSERT INTO command_search VALUES (?, ?, ?, ?, ?)",
+            map(search_row, itertools.islice(_month_log_entries(month), skip, None))
+        )
+        return cursor.rowcount
+    except Exception as e:
+        print(f"Error reading log file commands_{month}.json: {e}")
+        return 0
+
+def _month_log_signature(month: str) -> list:
+    """Return the size and modification time of a month's JSON log files, to detect appends"""
+    signature = []
+    for path in _find_log_files(os.path.join(LOGS_DIR, f"commands_{month}.json")):
+        stat = os.stat(path)
+        signature.append((path, stat.st_size, stat.st_mtime_ns))
+    return signature
+
+def rebuild_search_index() -> int:
     """
-    Get the most recent log entries with email and full command output
+    Rebuild the full-text search index from the monthly JSON logs (including archives)
     
-    Args:
-        count: Number of recent logs to retrieve
+    The new index is built in a separate database file, so commands logged in
+    the meantime keep going into the current index. Just before the new file
+    is swapped in, the log write lock is taken and entries appended to the
+    logs since they were read are added to it.
     
     Returns:
-        List of recent log entries with email and command data
+        Number of log entries indexed
     """
-    current_month = datetime.now().strftime('%Y%m')
-    json_file = os.path.join(LOGS_DIR, f"commands_{current_month}.json")
+    def json_months():
+        return sorted({
+            match.group(1)
+            for match in map(_LOG_NAME_RE.match, os.listdir(LOGS_DIR))
+            if match and match.group(2) == "json"
+        })
     
-    if not os.path.exists(json_file):
-        return []
+    tmp_path = f"{SEARCH_DB_PATH}.{os.getpid()}.rebuild"
+    if os.path.exists(tmp_path):
+        os.unlink(tmp_path)
+    conn = _connect_search_index(tmp_path)
     
+    # month -> (signature of its files when read, entries indexed)
+    progress = {}
     try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with conn:
+            for month in json_months():
+                signature = _month_log_signature(month)
+                progress[month] = (signature, _index_month(conn, month, 0))
         
-        # Sort by timestamp (most recent first) and take the requested count
-        sorted_data = sorted(data, key=lambda x: x["timestamp"], reverse=True)
-        return sorted_data[:count]
-    except Exception as e:
-        print(f"Error reading log file: {e}")
-        return []
+        with _log_write_lock():
+            with conn:
+                for month in json_months():
+                    signature, indexed = progress.get(month, (None, 0))
+                    if signature != _month_log_signature(month):
+                        progress[month] = (None, indexed + _index_month(conn, month, indexed))
+                conn.execute("INSERT INTO command_search(command_search) VALUES ('optimize')")
+            conn.close()
+            # Live inserts hold the write lock too, so a journal left now is from a crashed
+            # writer of the old index and must not be rolled back into the new one
+            if os.path.exists(SEARCH_DB_PATH + "-journal"):
+                os.unlink(SEARCH_DB_PATH + "-journal")
+            os.replace(tmp_path, SEARCH_DB_PATH)
+    finally:
+        conn.close()
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+    return sum(indexed for _, indexed in progress.values())
+
+def _find_log_files(filename: str) -> list:
+    """
+    Return the existing parts of a log, oldest first: its compressed archive and
+    the plain file. Both exist when an entry was written after the period was
+    archived, until the next rotation merges them.
+    """
+    return [path for path in (filename + ARCHIVE_SUFFIX, filename) if os.path.exists(path)]
+
+def _open_log(path: str, mode: str = 'r'):
+    """Open a log file for text access, decompressing archives as a stream"""
+    if path.endswith(ARCHIVE_SUFFIX):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+def _is_finished_period(period: str, now: datetime) -> bool:
+    """Return True if a YYYYMM or YYYYMMDD period is over and will not be written again"""
+    if len(period) == 6:
+        return period < now.strftime('%Y%m')
+    return period < now.strftime('%Y%m%d')
+
+def _months_between(start: datetime, end: datetime) -> list:
+    """Return the YYYYMM months touched by an inclusive date range"""
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append(f"{year:04d}{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
 
-def get_log_stats(month: str = None) -> Dict[str, Any]:
+def _compress_file(path: str):
     """
-    Get statistics about logged commands
+    Compress a finished log file into an archive segment and remove the original
+    
+    If the period already has an archive (an entry arrived after it was
+    compressed), the file is merged into it: JSON entries are spliced into the
+    archived array, CSV rows and TXT blocks are appended as a new gzip member.
+    The merged archive is written to a temp file and swapped in, so the old
+    archive stays intact until its replacement is complete. Callers must hold
+    the log write lock.
+    """
+    archive_path = path + ARCHIVE_SUFFIX
+    tmp_path = archive_path + ".tmp"
+    if not os.path.exists(archive_path):
+        with open(path, 'rb') as src, gzip.open(tmp_path, 'wb') as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+    elif path.endswith(".json"):
+        with gzip.open(tmp_path, 'wb') as dst:
+            separator = b"[\n"
+            for source in (archive_path, path):
+                for entry in iter_log_entries(source):
+                    dst.write(separator + json_array_item(entry))
+                    separator = b",\n"
+            dst.write(b"\n]" if separator == b",\n" else b"[\n]")
+    else:
+        shutil.copyfile(archive_path, tmp_path)
+        with open(path, 'rb') as src, gzip.open(tmp_path, 'ab') as dst:
+            if path.endswith(".csv"):
+                src.readline()  # The archive already starts with the header row
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+    os.replace(tmp_path, archive_path)
+    os.unlink(path)
+
+def rotate_logs(disk_budget: int = None) -> Dict[str, Any]:
+    """
+    Compress finished periods and enforce the log files' disk budget
+    
+    Monthly JSON/CSV files are archived once their month is over and daily
+    TXT files once their day is over. If the log files are still above the
+    budget afterwards, the oldest archive segments are deleted first.
+    A file written after its period was archived is merged into the existing
+    archive. Uncompressed files for the current period are never touched, and other
+    files in the directory (such as the search index) do not count toward
+    the budget. Archives are kept if deleting them could not bring the log
+    files under the budget.
     
     Args:
-        month: Optional month in YYYYMM format (e.g., "202405")
-               If None, uses current month
+        disk_budget: Maximum bytes for the logs directory (defaults to LOG_DISK_BUDGET)
     
     Returns:
-        Dictionary with statistics
+        Dictionary with the compressed and pruned file names, the final size of the
+        log files, the size of other files and whether the budget is still exceeded
     """
-    if month is None:
-        month = datetime.now().strftime('%Y%m')
+    if disk_budget is None:
+        disk_budget = LOG_DISK_BUDGET
     
-    json_file = os.path.join(LOGS_DIR, f"commands_{month}.json")
+    now = datetime.now()
+    result = {"compressed": [], "pruned": [], "total_bytes": 0}
     
-    if not os.path.exists(json_file):
-        return {"error": "No log file found for specified month"}
+    for name in sorted(os.listdir(LOGS_DIR)):
+        match = _LOG_NAME_RE.match(name)
+        if not match or match.group(3) or not _is_finished_period(match.group(1), now):
+            continue
+        try:
+            # Under the write lock, so no entry is appended between the copy and the unlink
+            with _log_write_lock():
+                _compress_file(os.path.join(LOGS_DIR, name))
+            result["compressed"].append(name)
+        except Exception as e:
+            print(f"Error compressing log file {name}: {e}")
     
-    try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        stats = {
-            "total_commands": len(data),
-            "command_types": {},
-            "emails_used": set(),
-            "cards_used": set(),
-            "date_range": {"start": None, "end": None}
-        }
+    # Collect archive segments oldest first, keyed by their period. Only log files count
+    # toward the budget; the search index and other files cannot be pruned here.
+    archives = []
+    total_bytes = 0
+    other_bytes = 0
+    for name in os.listdir(LOGS_DIR):
+        path = os.path.join(LOGS_DIR, name)
+        if not os.path.isfile(path):
+            continue
+        size = os.path.getsize(path)
+        match = _LOG_NAME_RE.match(name)
+        if not match:
+            other_bytes += size
+            continue
+        total_bytes += size
+        if match.group(3):
+            archives.append((match.group(1)[:6], match.group(1), name, size))
+    archives.sort()
+    
+    # If the current, uncompressed logs alone exceed the budget, deleting every
+    # archive would not help; keep them and report the overage instead
+    archive_bytes = sum(size for _, _, _, size in archives)
+    if total_bytes - archive_bytes <= disk_budget:
+        for _, _, name, size in archives:
+            if total_bytes <= disk_budget:
+                break
+            try:
+                os.unlink(os.path.join(LOGS_DIR, name))
+                total_bytes -= size
+                result["pruned"].append(name)
+            except Exception as e:
+                print(f"Error pruning log archive {name}: {e}")
+    
+    result["total_bytes"] = total_bytes
+    result["other_bytes"] = other_bytes
+    result["over_budget"] = total_bytes > disk_budget
+    return result
+
+def iter_log_entries(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream entries from a monthly JSON log one at a time
+    
+    Parses the top-level array incrementally with raw_decode, so only the
+    current entry and one read chunk are held in memory regardless of the
+    file size. Works on plain files and .gz archives.
+    
+    Args:
+        path: Path to a commands_YYYYMM.json file or its archive
+    
+    Yields:
+        Log entry dictionaries in file order
+    """
+    decoder = json.JSONDecoder()
+    whitespace = " \t\n\r"
+    
+    with _open_log(path) as f:
+        buf = f.read(STREAM_CHUNK_SIZE)
+        pos = len(buf) - len(buf.lstrip(whitespace))
+        if pos >= len(buf):
+            return
+        if buf[pos] != "[":
+            raise ValueError(f"{path} is not a JSON array")
+        pos += 1
+        eof = False
         
-        for entry in data:
-            # Count command types
-            cmd_type = entry["command_type"]
-            stats["command_types"][cmd_type] = stats["command_types"].get(cmd_type, 0) + 1
-            
-            # Track emails
-            if entry.get("email_used"):
-                stats["emails_used"].add(entry["email_used"])
+        while True:
+            # Skip separators between entries
+            while pos < len(buf) and buf[pos] in whitespace + ",":
+                pos += 1
+            if pos >= len(buf):
+                if eof:
+                    raise ValueError(f"{path} ended before the closing bracket")
+                chunk = f.read(STREAM_CHUNK_SIZE)
+                eof = not chunk
+                buf, pos = chunk, 0
+                continue
+            if buf[pos] == "]":
+                return
             
-            # Track cards (digits 9-12)
-            if entry.get("card_digits_9_12"):
-                stats["cards_used"].add(entry["card_digits_9_12"])
+            try:
+                entry, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # The entry straddles the chunk boundary, so read more and retry
+                if eof:
+                    raise
+                chunk = f.read(STREAM_CHUNK_SIZE)
+                eof = not chunk
+                buf, pos = buf[pos:] + chunk, 0
+                continue
             
-            # Track date range
-            entry_date = entry["timestamp"]
-            if stats["date_range"]["start"] is None or entry_date < stats["date_range"]["start"]:
-                stats["date_range"]["start"] = entry_date
-            if stats["date_range"]["end"] is None or entry_date > stats["date_range"]["end"]:
-                stats["date_range"]["end"] = entry_date
-        
-        stats["unique_emails"] = len(stats["emails_used"])
-        stats["unique_cards"] = len(stats["cards_used"])
-        stats["emails_used"] = list(stats["emails_used"])  # Convert set to list for JSON serialization
-        stats["cards_used"] = list(stats["cards_used"])  # Convert set to list for JSON serialization
-        
-        return stats
+            yield entry
+            pos = end
+
+def _month_log_entries(month: str) -> Iterator[Dict[str, Any]]:
+    """Stream the entries of a month's JSON log and its archive, or nothing if there is no log"""
+    for json_file in _find_log_files(os.path.join(LOGS_DIR, f"commands_{month}.json")):
+        yield from iter_log_entries(json_file)
+
+def _most_recent_logs(count: int) -> list:
+    """Return the most recent entries of the current month, keeping only `count` in memory"""
+    current_month = datetime.now().strftime('%Y%m')
+    try:
+        return heapq.nlargest(count, _month_log_entries(current_month), key=lambda x: x["timestamp"])
     except Exception as e:
-        return {"error": f"Error reading log file: {e}"}
\ No newline at end of file
+        print(f"Error reading log file: {e}")
+        return []
+
+def get_recent_logs(count: int = 10) -> list:
+    """
+    Get the most recent log entries
+    
+    Args:
+        count: Number of recent logs to retrieve
+    
+    Returns:
+        List of recent log entries
+    """
+    return _most_recent_logs(count)
+
+def get_full_logs(count: int = 5) -> list:
+    """
+    Get the most recent log entries with email and full command output
+    
+    Args:
+        count: Number of recent logs to retrieve
+    
+    Returns:
+        List of recent log entries with email and command data
+    """
+    return _most_recent_logs(count)
@@ -0,0 +1,120 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any
+
+
+class LoopWatchdog:
+    """
+    Measure event loop lag and report the code that blocks the loop.
+
+    A coroutine on the loop sleeps for `interval` seconds and records how
+    late it wakes up; that delay is the loop lag. A separate thread watches
+    the coroutine's heartbeat, and when the loop has not come back for
+    longer than `threshold` seconds it captures the loop thread's current
+    stack, i.e. the blocking frame, while the stall is still happening.
+    """
+
+    def __init__(self, interval: float = 0.1, threshold: float = 0.25, window: int = 6000):
+        self.interval = interval
+        self.threshold = threshold
+        self.lags = deque(maxlen=window)  # seconds, most recent last
+        self.stalls = deque(maxlen=20)
+        self.stall_count = 0
+        self._beat = None
+        self._reported_beat = None
+        self._loop_thread_id = None
+        self._task = None
+        self._thread = None
+        self._running = False
+
+    def start(self):
+        """Start monitoring the running event loop. Must be called from a coroutine."""
+        if self._running:
+            return
+        self._running = True
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._monitor())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _monitor(self):
+        try:
+            while self._running:
+                expected = time.monotonic() + self.interval
+                await asyncio.sleep(self.interval)
+                now = time.monotonic()
+                self.lags.append(max(0.0, now - expected))
+                self._beat = now
+        finally:
+            # The loop is shutting down; stop the watcher thread too
+            self._running = False
+
+    def _watch(self):
+        while self._running:
+            time.sleep(self.interval)
+            beat = self._beat
+            stalled = time.monotonic() - beat - self.interval
+            if stalled > self.threshold and beat != self._reported_beat:
+                # Report each stall once, while the loop thread is still inside it
+                self._reported_beat = beat
+                self._report_stall(stalled)
+
+    def _report_stall(self, stalled: float):
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        stack = traceback.format_stack(frame)
+        stall = {
+            "time": datetime.now().isoformat(timespec='seconds'),
+            "lag_ms": stalled * 1000,
+            "command": _find_command_name(frame),
+            "stack": "".join(stack[-8:]),
+        }
+        self.stalls.append(stall)
+        self.stall_count += 1
+        print(
+            f"⚠️ Event loop blocked for {stall['lag_ms']:.0f}+ ms "
+            f"(command: {stall['command'] or 'unknown'}). Blocking stack:\n{stall['stack']}"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Return rolling lag percentiles in milliseconds over the recorded window."""
+        samples = sorted(self.lags)
+        if not samples:
+            return {"samples": 0}
+
+        def pct(p: float) -> float:
+            return samples[min(len(samples) - 1, int(p / 100 * len(samples)))] * 1000
+
+        return {
+            "samples": len(samples),
+            "window_s": len(samples) * self.interval,
+            "p50_ms": pct(50),
+            "p95_ms": pct(95),
+            "p99_ms": pct(99),
+            "max_ms": samples[-1] * 1000,
+            "stall_count": self.stall_count,
+            "last_stall": self.stalls[-1] if self.stalls else None,
+        }
+
+
+def _find_command_name(frame) -> str:
+    """Walk a stack looking for a handler's `interaction` local and return its command name."""
+    while frame is not None:
+        interaction = frame.f_locals.get("interaction")
+        command = getattr(interaction, "command", None)
+        if command is not None:
+            return getattr(command, "qualified_name", None)
+        frame = frame.f_back
+    return None
@@ -0,0 +1,137 @@
+import os
+import time
+import asyncio
+
+from discord.ext import tasks
+
+try:
+    import fcntl
+except ImportError:  # Windows has no flock; run one bot process per host there
+    fcntl = None
+
+from db import run_maintenance, seconds_since_last_pop, backup_db, seconds_since_last_backup, DB_PATH
+from logging_utils import rotate_logs
+from loop_watchdog import LoopWatchdog
+
+# Background jobs live outside the cogs so they keep running across /reload.
+
+# Log rotation, DB maintenance and backups touch files shared by every bot process
+# on the host, so only the process holding this lock runs them. The lock is held
+# for the life of the process and released by the OS if it exits.
+BACKGROUND_LOCK_PATH = DB_PATH.parent / 'background_tasks.lock'
+_background_lock = None
+
+# Pool database maintenance: run every interval, but only once pops have been idle this long
+DB_MAINTENANCE_INTERVAL = float(os.getenv('DB_MAINTENANCE_INTERVAL_MIN', '60')) * 60  # seconds
+DB_MAINTENANCE_IDLE = float(os.getenv('DB_MAINTENANCE_IDLE_SEC', '120'))  # seconds
+
+# Online pool backups
+DB_BACKUP_INTERVAL = float(os.getenv('DB_BACKUP_INTERVAL_HOURS', '24'))  # hours
+
+# Event loop lag watchdog: stalls longer than this are logged with the blocking stack
+LOOP_LAG_THRESHOLD = float(os.getenv('LOOP_LAG_THRESHOLD_MS', '250')) / 1000  # seconds
+loop_watchdog = LoopWatchdog(threshold=LOOP_LAG_THRESHOLD)
+
+# Background task: compress finished log periods and enforce the disk budget
+@tasks.loop(hours=6)
+async def log_rotation_task():
+    try:
+        result = await asyncio.to_thread(rotate_logs)
+        if result["compressed"] or result["pruned"]:
+            print(f"Log rotation: compressed {len(result['compressed'])}, pruned {len(result['pruned'])} files")
+        if result["over_budget"]:
+            print(f"⚠️ Log files use {result['total_bytes'] // (1024 * 1024)} MB, above LOG_DISK_BUDGET_MB")
+    except Exception as e:
+        print(f"Log rotation failed: {e}")
+
+# Pool database maintenance state
+_last_maintenance = {"time": None, "report": None}
+
+def format_maintenance_report(report: dict) -> str:
+    """Format a run_maintenance report for Discord."""
+    lines = [
+        f"WAL checkpoint: {report['checkpoint_ms']:.1f} ms" + (" (busy, partial)" if report['checkpoint_busy'] else ""),
+        f"ANALYZE: {report['analyze_ms']:.1f} ms",
+        f"Incremental VACUUM: {report['vacuum_ms']:.1f} ms ({report['pages_freed']} pages freed, {report['free_pages']} free)",
+        f"Quick check: {report['quick_check_ms']:.1f} ms",
+    ]
+    if report['problems']:
+        lines.append("⚠️ Integrity problems (restart the bot to quarantine the database):")
+        lines.extend(f"  • {problem}" for problem in report['problems'][:10])
+    else:
+        lines.append("Integrity: ok")
+    return "\n".join(lines)
+
+async def maintain_db() -> dict:
+    """Run pool database maintenance off the event loop and record the report."""
+    report = await asyncio.to_thread(run_maintenance)
+    _last_maintenance["time"] = time.monotonic()
+    _last_maintenance["report"] = report
+    print("DB maintenance:\n" + format_maintenance_report(report))
+    return report
+
+# Background task: run pool maintenance when it is due and pops are idle
+@tasks.loop(minutes=5)
+async def db_maintenance_task():
+    last = _last_maintenance["time"]
+    if last is not None and time.monotonic() - last < DB_MAINTENANCE_INTERVAL:
+        return
+    idle = seconds_since_last_pop()
+    if idle is not None and idle < DB_MAINTENANCE_IDLE:
+        return
+    try:
+        await maintain_db()
+    except Exception as e:
+        print(f"DB maintenance failed: {e}")
+
+# Background task: snapshot the pool database with the online backup API once the newest
+# snapshot is an interval old, so restarts and takeovers do not take extra backups
+@tasks.loop(minutes=5)
+async def db_backup_task():
+    age = seconds_since_last_backup()
+    if age is not None and age < DB_BACKUP_INTERVAL * 3600:
+        return
+    try:
+        result = await asyncio.to_thread(backup_db)
+        print(f"DB backup: {result['path'].name} ({result['size'] // 1024} KB) in {result['backup_ms']:.0f} ms")
+    except Exception as e:
+        print(f"DB backup failed: {e}")
+
+def _acquire_background_lock() -> bool:
+    """Try to become the process that runs the shared background jobs."""
+    global _background_lock
+    if _background_lock is not None or fcntl is None:
+        return True
+    lock_file = open(BACKGROUND_LOCK_PATH, 'a')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        return False
+    _background_lock = lock_file
+    return True
+
+def _start_shared_tasks():
+    if not log_rotation_task.is_running():
+        log_rotation_task.start()
+    if not db_maintenance_task.is_running():
+        db_maintenance_task.start()
+    if not db_backup_task.is_running():
+        db_backup_task.start()
+
+# Background task: take over the shared jobs if the process running them exits
+@tasks.loop(minutes=1)
+async def background_takeover_task():
+    if _acquire_background_lock():
+        print("Took over log rotation, DB maintenance and backups from another process")
+        _start_shared_tasks()
+        background_takeover_task.stop()
+
+def start_background_tasks():
+    """Start the watchdog and background loops; safe to call again after a reconnect."""
+    loop_watchdog.start()
+    if _acquire_background_lock():
+        _start_shared_tasks()
+    elif not background_takeover_task.is_running():
+        print("Log rotation, DB maintenance and backups are running in another process")
+        background_takeover_task.start()
@@ -0,0 +1,38 @@
+import asyncio
+import os
+import time
+
+# Idempotency cache: (channel ID, command type, options) -> (expires_at, response).
+# All shards in a process share one event loop, and a channel always belongs to one
+# shard, so this per-process cache stays consistent when shards are split across hosts.
+# It lives outside the cogs so cached results survive /reload.
+ORDER_CACHE_TTL = float(os.getenv('ORDER_CACHE_TTL', '600'))  # seconds
+_order_cache = {}
+_order_locks = {}
+
+def order_lock(key: tuple) -> asyncio.Lock:
+    """Return the lock serializing order commands for one ticket and command type."""
+    lock = _order_locks.get(key)
+    if lock is None:
+        lock = _order_locks[key] = asyncio.Lock()
+    return lock
+
+def get_cached_order(key: tuple) -> str:
+    """Return the cached response for an order key if it has not expired, else None."""
+    cached = _order_cache.get(key)
+    if cached is None:
+        return None
+    expires_at, response = cached
+    if expires_at < time.monotonic():
+        del _order_cache[key]
+        return None
+    return response
+
+def cache_order(key: tuple, response: str):
+    """Cache a formatted order response and drop expired entries."""
+    now = time.monotonic()
+    for stale in [k for k, (expires_at, _) in _order_cache.items() if expires_at < now]:
+        del _order_cache[stale]
+    for idle in [k for k, lock in _order_locks.items() if k not in _order_cache and not lock.locked()]:
+        del _order_locks[idle]
+    _order_cache[key] = (now + ORDER_CACHE_TTL, response)
@@ -0,0 +1,131 @@
+import cProfile
+import io
+import os
+import pstats
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, Any
+
+# Lines of pstats / tracemalloc output included in the summary
+SUMMARY_LIMIT = 25
+
+# The active profiling session, or None. Nothing is hooked in while this is None,
+# so profiling costs nothing when it is off.
+_session = None
+
+
+def is_profiling() -> bool:
+    """Return True while a profiling session is running"""
+    return _session is not None
+
+
+def start_profiling(cpu: bool = True, memory: bool = False, interactions: int = 0, seconds: float = 60) -> Dict[str, Any]:
+    """
+    Start profiling the event loop thread
+
+    cProfile records every call made on the calling thread, which is where the
+    order handlers, db pops and logging calls run. tracemalloc records
+    allocations from all threads.
+
+    Args:
+        cpu: Enable cProfile
+        memory: Enable tracemalloc
+        interactions: Stop after this many completed interactions (0 = no limit)
+        seconds: Stop after this many seconds
+
+    Returns:
+        The new session state
+    """
+    global _session
+    if _session is not None:
+        raise RuntimeError("A profiling session is already running")
+    if not cpu and not memory:
+        raise ValueError("Enable at least one of cpu or memory profiling")
+
+    profiler = None
+    if cpu:
+        profiler = cProfile.Profile()
+        profiler.enable()
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start(10)
+
+    _session = {
+        "profiler": profiler,
+        "memory": memory,
+        "interactions": interactions,
+        "seconds": seconds,
+        "completed": 0,
+        "commands": {},
+        "started": time.perf_counter(),
+    }
+    return _session
+
+
+def record_interaction(command_name: str) -> bool:
+    """
+    Count a completed interaction in the running session
+
+    Returns:
+        True if the session reached its interaction limit and should be stopped
+    """
+    if _session is None:
+        return False
+    _session["completed"] += 1
+    _session["commands"][command_name] = _session["commands"].get(command_name, 0) + 1
+    limit = _session["interactions"]
+    return bool(limit) and _session["completed"] >= limit
+
+
+def stop_profiling() -> Dict[str, Any]:
+    """
+    Stop the running session and build its report
+
+    Returns:
+        Dictionary with the summary text, the path of the binary cProfile
+        dump (loadable with pstats or snakeviz) if CPU profiling was on,
+        and the session counters
+    """
+    global _session
+    session, _session = _session, None
+    if session is None:
+        raise RuntimeError("No profiling session is running")
+
+    elapsed = time.perf_counter() - session["started"]
+    sections = [
+        f"Profiled {session['completed']} interactions over {elapsed:.1f}s",
+        "Commands: " + (", ".join(f"{name} x{count}" for name, count in sorted(session["commands"].items())) or "none"),
+    ]
+
+    prof_path = None
+    profiler = session["profiler"]
+    if profiler is not None:
+        profiler.disable()
+        fd, prof_path = tempfile.mkstemp(suffix=".prof")
+        os.close(fd)
+        profiler.dump_stats(prof_path)
+
+        stream = io.StringIO()
+        stats = pstats.Stats(profiler, stream=stream)
+        stats.strip_dirs().sort_stats("cumulative").print_stats(SUMMARY_LIMIT)
+        sections.append("=== CPU (cProfile, sorted by cumulative time) ===\n" + stream.getvalue().strip())
+
+    if session["memory"]:
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        snapshot = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ])
+        lines = [f"Current: {current / 1024:.0f} KB, peak: {peak / 1024:.0f} KB"]
+        for stat in snapshot.statistics("lineno")[:SUMMARY_LIMIT]:
+            lines.append(str(stat))
+        sections.append("=== Memory (tracemalloc, top allocation sites) ===\n" + "\n".join(lines))
+
+    return {
+        "summary": "\n\n".join(sections),
+        "prof_path": prof_path,
+        "completed": session["completed"],
+        "elapsed": elapsed,
+    }
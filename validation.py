@@ -0,0 +1,47 @@
+def parse_card_line(line: str):
+    """
+    Parse and validate a `cardnum,cvv` line from a bulk card file.
+    Returns:
+        tuple: ((number, cvv), None) if valid, or (None, reason) if not.
+    """
+    parts = line.split(',')
+    if len(parts) != 2:
+        return None, "expected format: cardnum,cvv"
+
+    number, cvv = parts[0].strip(), parts[1].strip()
+
+    if not number or not cvv:
+        return None, "empty card number or CVV"
+
+    # Card number must be numeric and a reasonable length
+    if not number.isdigit() or len(number) < 13 or len(number) > 19:
+        return None, "invalid card number format"
+
+    # CVV must be numeric and 3-4 digits
+    if not cvv.isdigit() or len(cvv) < 3 or len(cvv) > 4:
+        return None, "invalid CVV format"
+
+    return (number, cvv), None
+
+
+def parse_email_line(line: str):
+    """
+    Parse and validate a line from a bulk email file.
+    Returns:
+        tuple: (email, None) if valid, or (None, reason) if not.
+    """
+    email = line.strip()
+
+    if not email:
+        return None, "empty email"
+
+    # Must contain @ and have a reasonable length
+    if '@' not in email or len(email) < 5:
+        return None, "invalid email format"
+
+    # Exactly one @ with a local part and a dotted domain
+    parts = email.split('@')
+    if len(parts) != 2 or not parts[0] or not parts[1] or '.' not in parts[1]:
+        return None, "invalid email format"
+
+    return email, None